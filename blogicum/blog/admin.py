@@ -1,6 +1,95 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import PAGE_VAR
+from django.contrib.auth import get_user_model
+from django.utils.text import smart_split, unescape_string_literal
 
 from .models import Category, Location, Post, Comments
+from .paginator import EstimatedCountPaginator
+from .search import match_posts
+
+
+class UsernameFilter(admin.SimpleListFilter):
+    """Фильтр по имени автора через поле ввода.
+
+    Стандартный фильтр по внешнему ключу выводит в боковую панель
+    всех пользователей; этот принимает точное имя и отбирает строки
+    по индексу внешнего ключа.
+    """
+
+    title = 'автор'
+    parameter_name = 'author'
+    template = 'admin/blog/username_filter.html'
+
+    def lookups(self, request, model_admin):
+        return ()
+
+    def has_output(self):
+        return True
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{
+                f'{self.parameter_name}__in':
+                    get_user_model().objects.filter(username=self.value()),
+            })
+        return queryset
+
+    def choices(self, changelist):
+        yield {
+            'parameter_name': self.parameter_name,
+            'value': self.value() or '',
+            'hidden_params': [
+                (name, value) for name, value in changelist.params.items()
+                if name not in (self.parameter_name, PAGE_VAR)
+            ],
+            'reset_query_string': changelist.get_query_string(
+                remove=[self.parameter_name]),
+        }
+
+
+class LargeTableAdminMixin:
+    """Настройки списка для таблиц на миллионы строк.
+
+    Без второго COUNT(*) по всей таблице, без подсчёта фасетов
+    и с оценкой числа строк для списка без фильтров.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+
+
+class IndexedSearchMixin:
+    """Поиск в списке админки по индексам связанных таблиц.
+
+    Элементы ``search_fields`` имеют вид ``'связь__поле'``: слово
+    сравнивается с полем связанной модели на точное совпадение, а строки
+    отбираются подзапросом по внешнему ключу. Совпадения по разным полям
+    объединяются через UNION первичных ключей, а не OR с JOIN: так
+    каждое покрыто своим индексом и планировщик не сканирует таблицу.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        for bit in smart_split(search_term):
+            if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+                bit = unescape_string_literal(bit)
+            queryset = queryset.filter(
+                pk__in=self.get_term_matches(request, bit)
+            )
+        return queryset, False
+
+    def get_term_matches(self, request, term):
+        """Первичные ключи строк, совпавших со словом хотя бы в одном поле."""
+        manager = self.model._default_manager
+        matches = []
+        for search_field in self.get_search_fields(request):
+            relation, field = search_field.split('__', 1)
+            related_model = self.opts.get_field(relation).related_model
+            matches.append(manager.filter(**{
+                f'{relation}__in':
+                    related_model._default_manager.filter(**{field: term}),
+            }).order_by().values('pk'))
+        return matches[0].union(*matches[1:])
 
 
 @admin.register(Category)
@@ -12,25 +101,19 @@ class CategoryAdmin(admin.ModelAdmin):
         'created_at',
         'is_published',
     ]
-    search_fields = [
-        'title',
-        'description',
-        'slug',
-        'created_at',
-        'is_published',
-    ]
+    search_fields = ['title', 'slug']
     list_filter = ['created_at', 'is_published']
 
 
 @admin.register(Location)
 class LocationAdmin(admin.ModelAdmin):
     list_display = ['name', 'is_published', 'created_at']
-    search_fields = ['name', 'is_published', 'created_at']
-    list_filter = ['name', 'is_published', 'created_at']
+    search_fields = ['name']
+    list_filter = ['is_published', 'created_at']
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(LargeTableAdminMixin, IndexedSearchMixin, admin.ModelAdmin):
     list_display = [
         'title',
         'pub_date',
@@ -39,29 +122,32 @@ class PostAdmin(admin.ModelAdmin):
         'category',
         'is_published',
     ]
-    search_fields = [
-        'title',
-        'pub_date',
-        'author',
-        'location',
-        'category',
-        'is_published',
-    ]
-    list_filter = ['author', 'location', 'category', 'is_published']
+    search_fields = ['author__username', 'category__slug']
+    search_help_text = (
+        'Имя автора, идентификатор категории '
+        'или слова из заголовка и текста.'
+    )
+    list_select_related = ['author', 'location', 'category']
+    list_filter = [UsernameFilter, 'location', 'category', 'is_published']
+    autocomplete_fields = ['author', 'location', 'category']
+
+    def get_term_matches(self, request, term):
+        return super().get_term_matches(request, term).union(
+            match_posts(Post.objects.all(), term).order_by().values('pk')
+        )
 
 
 @admin.register(Comments)
-class CommentsAdmin(admin.ModelAdmin):
+class CommentsAdmin(LargeTableAdminMixin, IndexedSearchMixin,
+                    admin.ModelAdmin):
     list_display = [
         'text',
         'post',
         'author',
         'created_at',
     ]
-    search_fields = [
-        'text',
-        'post',
-        'author',
-        'created_at',
-    ]
-    list_filter = ['author', 'created_at', ]
+    search_fields = ['author__username']
+    search_help_text = 'Имя автора комментария.'
+    list_select_related = ['post', 'author']
+    list_filter = [UsernameFilter, 'created_at']
+    autocomplete_fields = ['post', 'author']
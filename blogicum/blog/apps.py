@@ -1,7 +1,16 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
     verbose_name = 'Блог'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        if settings.TEMPLATE_WARMUP:
+            from .warmup import warm_up_templates
+
+            warm_up_templates()
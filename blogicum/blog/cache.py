@@ -0,0 +1,350 @@
+import hashlib
+import math
+from functools import wraps
+from inspect import iscoroutinefunction
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db.models import Min
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from blogicum.routers import reads_from_replica, use_primary
+
+from .const import CACHE_VERSION_TIMEOUT, FEED_PAGE_CACHE_TIMEOUT
+from .models import Post
+
+POST_CARD_VERSION_KEY = 'blog:post-card-version:{}'
+FEED_VERSION_KEY = 'blog:feed-version:{}'
+FEED_PAGE_KEY = 'blog:feed-page:{}:{}:{}'
+FEED_PAGE_PARAMS = ('page', 'after', 'before')
+ALL_FEEDS = '*'
+INDEX_FEED = 'index'
+CATEGORY_FEED = 'category:{category_slug}'
+PROFILE_FEED = 'profile:{username}'
+NEXT_PUBLICATION_KEY = 'blog:next-publication'
+POST_STATE_KEY = 'blog:post-state:{}:{}'
+
+
+def get_versions(keys):
+    """Читает версии из кэша, заменяя отсутствующие новыми.
+
+    Потерянная или истёкшая версия не может вернуть к жизни устаревшую
+    запись: ключи, построенные на новой версии, ещё не заполнены.
+    """
+    versions = cache.get_many(keys)
+    missing = _new_versions(keys, versions)
+    if missing:
+        cache.set_many(missing, timeout=CACHE_VERSION_TIMEOUT)
+        versions.update(missing)
+    return versions
+
+
+async def aget_versions(keys):
+    versions = await cache.aget_many(keys)
+    missing = _new_versions(keys, versions)
+    if missing:
+        await cache.aset_many(missing, timeout=CACHE_VERSION_TIMEOUT)
+        versions.update(missing)
+    return versions
+
+
+def _new_versions(keys, versions):
+    return {key: uuid4().hex for key in keys if key not in versions}
+
+
+def attach_post_card_versions(posts):
+    """Проставляет публикациям ``card_version`` для кэша карточек.
+
+    Версии читаются одним запросом к кэшу; отсутствующая версия
+    заменяется новой, так что старый фрагмент больше не отдаётся.
+    """
+    keys = {POST_CARD_VERSION_KEY.format(post.pk): post for post in posts}
+    _set_card_versions(keys, get_versions(keys))
+    return posts
+
+
+async def aattach_post_card_versions(posts):
+    keys = {POST_CARD_VERSION_KEY.format(post.pk): post for post in posts}
+    _set_card_versions(keys, await aget_versions(keys))
+    return posts
+
+
+def _set_card_versions(keys, versions):
+    # Фрагмент карточки, собранный по данным реплики, в кэш не пишется:
+    # он мог отстать от версии, под которой лёг бы.
+    timeout = 0 if reads_from_replica() else CACHE_VERSION_TIMEOUT
+    for key, post in keys.items():
+        post.card_version = versions[key]
+        post.card_cache_timeout = timeout
+
+
+def invalidate_post_cards(post_pks):
+    cache.delete_many(
+        [POST_CARD_VERSION_KEY.format(post_pk) for post_pk in post_pks]
+    )
+
+
+def _next_publication_query(now):
+    return Post.objects.filter(is_published=True, pub_date__gt=now)
+
+
+def _fresh_next_publication(next_publication, now):
+    """Ближайшая публикация из кэша; ``None`` — значение нужно пересчитать.
+
+    Пустая строка в кэше означает, что отложенных публикаций нет.
+    """
+    if next_publication and next_publication <= now:
+        return None
+    return next_publication
+
+
+def get_next_publication():
+    """Возвращает ближайшую дату отложенной публикации или None."""
+    now = timezone.now()
+    next_publication = _fresh_next_publication(
+        cache.get(NEXT_PUBLICATION_KEY), now)
+    if next_publication is not None:
+        return next_publication or None
+    next_publication = _next_publication_query(now).aggregate(
+        next_publication=Min('pub_date'))['next_publication']
+    cache.set(NEXT_PUBLICATION_KEY, next_publication or '', None)
+    return next_publication
+
+
+async def aget_next_publication():
+    now = timezone.now()
+    next_publication = _fresh_next_publication(
+        await cache.aget(NEXT_PUBLICATION_KEY), now)
+    if next_publication is not None:
+        return next_publication or None
+    next_publication = (await _next_publication_query(now).aaggregate(
+        next_publication=Min('pub_date')))['next_publication']
+    await cache.aset(NEXT_PUBLICATION_KEY, next_publication or '', None)
+    return next_publication
+
+
+def _page_timeout(next_publication):
+    if next_publication is None:
+        return FEED_PAGE_CACHE_TIMEOUT
+    seconds_left = (next_publication - timezone.now()).total_seconds()
+    return max(1, min(FEED_PAGE_CACHE_TIMEOUT, math.ceil(seconds_left)))
+
+
+def feed_page_timeout():
+    """Время жизни страницы ленты, истекающее к следующей публикации."""
+    return _page_timeout(get_next_publication())
+
+
+async def afeed_page_timeout():
+    return _page_timeout(await aget_next_publication())
+
+
+def invalidate_next_publication():
+    cache.delete(NEXT_PUBLICATION_KEY)
+
+
+async def aresolve_user(request):
+    """Загружает пользователя запроса через async ORM.
+
+    Ленивый ``request.user`` заменяется загруженным: иначе первое
+    обращение к нему из шаблона или валидатора пойдёт в базу
+    синхронно и в async-представлении упадёт.
+    """
+    request.user = await request.auser()
+    return request.user
+
+
+def _feed_version_keys(feed):
+    return [FEED_VERSION_KEY.format(ALL_FEEDS), FEED_VERSION_KEY.format(feed)]
+
+
+def make_etag(request, *parts):
+    """Собирает ETag из версий данных, пользователя и параметров."""
+    parts = (*parts, request.user.pk, request.GET.urlencode())
+    raw = ':'.join(str(part) for part in parts)
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def feed_etag(feed):
+    """etag_func для ``acondition``: версия ленты и ближайшей публикации."""
+    async def etag_func(request, *args, **kwargs):
+        keys = _feed_version_keys(feed.format(**kwargs))
+        versions = await aget_versions(keys)
+        return make_etag(
+            request,
+            *(versions[key] for key in keys),
+            await aget_next_publication(),
+        )
+    return etag_func
+
+
+async def _avisible_post(request, post_pk):
+    """Версии и даты публикации, если автор запроса может её видеть.
+
+    Правила те же, что у ``aget_visible_post``: для чужих снятых
+    с публикации и отложенных записей валидаторов нет, и представление
+    отвечает 404, а не 304. Правки комментариев, категории,
+    местоположения и автора меняют версию карточки, поэтому состояние
+    кэшируется под ней и читается из базы один раз.
+    """
+    keys = [FEED_VERSION_KEY.format(ALL_FEEDS),
+            POST_CARD_VERSION_KEY.format(post_pk)]
+    versions = await aget_versions(keys)
+    state_key = POST_STATE_KEY.format(post_pk, versions[keys[1]])
+    state = await cache.aget(state_key)
+    if state is None:
+        use_primary()
+        state = await Post.objects.filter(pk=post_pk).order_by().values_list(
+            'updated_at', 'pub_date', 'is_published',
+            'category__is_published', 'author_id',
+        ).afirst() or ''
+        await cache.aset(state_key, state, FEED_PAGE_CACHE_TIMEOUT)
+    if not state:
+        return None
+    (updated_at, pub_date, is_published,
+     category_is_published, author_id) = state
+    published = (is_published and category_is_published
+                 and pub_date <= timezone.now())
+    if not published and author_id != request.user.pk:
+        return None
+    return [versions[key] for key in keys], updated_at, pub_date
+
+
+async def post_etag(request, post_pk):
+    post = await _avisible_post(request, post_pk)
+    if post is None:
+        return None
+    versions, _, _ = post
+    return make_etag(request, *versions, await aget_next_publication())
+
+
+async def post_last_modified(request, post_pk):
+    """Last-Modified для ``acondition``: правка или выход публикации."""
+    post = await _avisible_post(request, post_pk)
+    if post is None:
+        return None
+    _, updated_at, pub_date = post
+    if pub_date <= timezone.now():
+        return max(updated_at, pub_date)
+    return updated_at
+
+
+def _validator_headers(etag, last_modified):
+    """Значения валидаторов в виде, который ждёт get_conditional_response."""
+    return (
+        quote_etag(etag) if etag else None,
+        int(last_modified.timestamp()) if last_modified else None,
+    )
+
+
+def acondition(etag_func=None, last_modified_func=None):
+    """``condition`` для async-представлений с async-валидаторами.
+
+    Django вызывает валидаторы ``condition`` синхронно, а запросы
+    к базе из async-контекста запрещены. Здесь валидаторы ждутся,
+    а ответ собирается тем же ``get_conditional_response``.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            await aresolve_user(request)
+            etag = last_modified = None
+            if etag_func:
+                etag = await etag_func(request, *args, **kwargs)
+            if last_modified_func:
+                last_modified = await last_modified_func(
+                    request, *args, **kwargs)
+            etag, last_modified = _validator_headers(etag, last_modified)
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            if (request.method in ('GET', 'HEAD')
+                    and response.status_code == 200):
+                if last_modified and not response.has_header(
+                        'Last-Modified'):
+                    response.headers['Last-Modified'] = http_date(
+                        last_modified)
+                if etag:
+                    response.headers.setdefault('ETag', etag)
+            return response
+        return wrapper
+    return decorator
+
+
+def feed_page_cache_key(feed, request):
+    version_keys = _feed_version_keys(feed)
+    return _feed_page_key(
+        request, version_keys, get_versions(version_keys))
+
+
+async def afeed_page_cache_key(feed, request):
+    version_keys = _feed_version_keys(feed)
+    return _feed_page_key(
+        request, version_keys, await aget_versions(version_keys))
+
+
+def _feed_page_key(request, version_keys, versions):
+    url = request.path + '?' + '&'.join(
+        f'{name}={request.GET[name]}'
+        for name in FEED_PAGE_PARAMS if name in request.GET
+    )
+    return FEED_PAGE_KEY.format(
+        versions[version_keys[0]],
+        versions[version_keys[1]],
+        hashlib.md5(url.encode()).hexdigest(),
+    )
+
+
+def cache_feed_page(feed):
+    """Кэширует страницы ленты для анонимных GET-запросов.
+
+    ``feed`` — шаблон имени ленты, заполняемый аргументами
+    представления; по нему страницы ленты сбрасываются разом.
+    Подходит и для обычных, и для async-представлений.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            return _cache_async_feed_page(feed, view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET' or request.user.is_authenticated:
+                return view(request, *args, **kwargs)
+            key = feed_page_cache_key(feed.format(**kwargs), request)
+            response = cache.get(key)
+            if response is None:
+                use_primary()
+                response = view(request, *args, **kwargs)
+                if response.status_code == 200:
+                    cache.set(key, response, feed_page_timeout())
+            return response
+        return wrapper
+    return decorator
+
+
+def _cache_async_feed_page(feed, view):
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await aresolve_user(request)
+        if request.method != 'GET' or user.is_authenticated:
+            return await view(request, *args, **kwargs)
+        key = await afeed_page_cache_key(feed.format(**kwargs), request)
+        response = await cache.aget(key)
+        if response is None:
+            use_primary()
+            response = await view(request, *args, **kwargs)
+            if response.status_code == 200:
+                await cache.aset(key, response, await afeed_page_timeout())
+        return response
+    return wrapper
+
+
+def invalidate_feeds(category_slugs=(), usernames=(), everything=False,
+                     index=True):
+    feeds = [ALL_FEEDS] if everything else [INDEX_FEED] * index + [
+        CATEGORY_FEED.format(category_slug=slug) for slug in category_slugs
+    ] + [PROFILE_FEED.format(username=username) for username in usernames]
+    cache.delete_many([FEED_VERSION_KEY.format(feed) for feed in feeds])
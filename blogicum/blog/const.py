@@ -1,2 +1,19 @@
 MAX_LENGTH = 256
 POSTS_PER_PAGE = 10
+FEED_PAGE_CACHE_TIMEOUT = 60 * 60
+# Столько же живёт фрагмент карточки в includes/post_card.html,
+# см. attach_post_card_versions.
+CACHE_VERSION_TIMEOUT = 60 * 60 * 24
+COMMENTS_PER_PAGE = 50
+IMAGE_VARIANTS = {
+    'thumb': 320,
+    'card': 640,
+    'full': 1280,
+}
+IMAGE_VARIANT_QUALITY = 80
+IMAGE_MAX_UPLOAD_SIZE = 10 * 1024 * 1024
+IMAGE_MAX_PIXELS = 40_000_000
+# Задача дольше этого считается брошенной упавшим воркером.
+IMAGE_JOB_TIMEOUT = 10 * 60
+SEARCH_CONFIG = 'russian'
+ESTIMATED_COUNT_THRESHOLD = 100_000
@@ -0,0 +1,12 @@
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def recount_comments(post_model, comment_model):
+    comments = comment_model.objects.filter(
+        post=OuterRef('pk')
+    ).order_by().values('post').annotate(total=Count('pk')).values('total')
+    total = Coalesce(Subquery(comments), 0)
+    return post_model.objects.exclude(comment_count=total).update(
+        comment_count=total
+    )
@@ -1,9 +1,56 @@
 from django import forms
 from django.contrib.auth.models import User
+from PIL import Image
 
+from .const import IMAGE_MAX_PIXELS, IMAGE_MAX_UPLOAD_SIZE
 from .models import Post, Comments
 
 
+class LimitedImageField(forms.ImageField):
+    """ImageField, отсекающий большие файлы до декодирования Pillow.
+
+    Размер проверяется по метке обработчика загрузки и по ``size``,
+    число пикселей — по заголовку изображения.
+    """
+
+    max_size = IMAGE_MAX_UPLOAD_SIZE
+    max_pixels = IMAGE_MAX_PIXELS
+    default_error_messages = {
+        'file_too_big': 'Размер файла не должен превышать %(limit)s МБ.',
+        'too_many_pixels': 'Изображение не должно быть больше '
+                           '%(limit)s мегапикселей.',
+    }
+
+    def to_python(self, data):
+        if data in self.empty_values:
+            return super().to_python(data)
+        if getattr(data, 'oversized', False) or data.size > self.max_size:
+            raise forms.ValidationError(
+                self.error_messages['file_too_big'],
+                code='file_too_big',
+                params={'limit': self.max_size // (1024 * 1024)},
+            )
+        if self.count_pixels(data) > self.max_pixels:
+            raise forms.ValidationError(
+                self.error_messages['too_many_pixels'],
+                code='too_many_pixels',
+                params={'limit': self.max_pixels // 1_000_000},
+            )
+        return super().to_python(data)
+
+    def count_pixels(self, data):
+        try:
+            with Image.open(data) as image:
+                width, height = image.size
+        except Image.DecompressionBombError:
+            return self.max_pixels + 1
+        except Exception:
+            return 0
+        finally:
+            data.seek(0)
+        return width * height
+
+
 class UserForm(forms.ModelForm):
     class Meta:
         model = User
@@ -17,6 +64,9 @@ class CreatePost(forms.ModelForm):
         widgets = {
             'pub_date': forms.DateInput(attrs={'type': 'date'})
         }
+        field_classes = {
+            'image': LimitedImageField,
+        }
 
 
 class CreateComments(forms.ModelForm):
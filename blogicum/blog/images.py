@@ -0,0 +1,100 @@
+from functools import partial
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps
+
+from .cache import invalidate_feeds, invalidate_post_cards
+from .const import IMAGE_VARIANT_QUALITY, IMAGE_VARIANTS
+from .models import Post
+from .storage import image_storage
+
+VARIANTS_DIR = 'images/variants/'
+
+
+def flatten(image):
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def release_image(name, variants, post_pk=None):
+    """Удаляет файл изображения и его копии, если на них никто не ссылается.
+
+    Копии строятся из оригинала детерминированно, поэтому общие у всех
+    публикаций с тем же оригиналом и живут, пока жив он.
+    """
+    if not name or Post.objects.filter(image=name).exclude(
+            pk=post_pk).exists():
+        return
+    image_storage.delete(name)
+    for variant in variants.values():
+        image_storage.delete(variant['name'])
+
+
+def referenced_images():
+    names = set()
+    for name, variants in Post.objects.exclude(image='').values_list(
+            'image', 'image_variants'):
+        names.add(name)
+        names.update(variant['name'] for variant in variants.values())
+    return names
+
+
+def build_image_variants(post):
+    """Сохраняет пережатые JPEG-копии изображения публикации.
+
+    Копии не увеличивают исходник: если он уже уже очередного
+    размера, этот размер ссылается на предыдущую копию. Пока копии
+    строились, автор мог загрузить новое изображение: тогда копии
+    старого не записываются в публикацию.
+    """
+    variants = {}
+    source_name = post.image.name
+    if post.image:
+        with post.image.open('rb') as image_file:
+            source = flatten(Image.open(image_file))
+        previous = None
+        for name, width in IMAGE_VARIANTS.items():
+            if previous and previous['width'] >= source.width:
+                variants[name] = previous
+                continue
+            image = source.copy()
+            image.thumbnail((width, image.height), Image.Resampling.LANCZOS)
+            buffer = BytesIO()
+            image.save(
+                buffer,
+                'JPEG',
+                quality=IMAGE_VARIANT_QUALITY,
+                optimize=True,
+                progressive=True,
+            )
+            previous = variants[name] = {
+                'name': image_storage.save(
+                    f'{VARIANTS_DIR}{name}.jpg',
+                    ContentFile(buffer.getvalue()),
+                ),
+                'width': image.width,
+                'height': image.height,
+            }
+    posts = Post.objects.filter(pk=post.pk, image=source_name)
+    if not posts.update(image_variants=variants):
+        # Оригинал уже освобождён заменой; копии общие с другими
+        # публикациями того же оригинала, поэтому удаляются по тем же
+        # правилам.
+        release_image(source_name, variants, post_pk=post.pk)
+        return
+    post.image_variants = variants
+    # update() не шлёт post_save: карточку и ленты сбрасываем сами.
+    category_slug, username = posts.values_list(
+        'category__slug', 'author__username').get()
+    transaction.on_commit(partial(invalidate_post_cards, [post.pk]))
+    transaction.on_commit(partial(
+        invalidate_feeds, [category_slug] if category_slug else [],
+        [username],
+    ))
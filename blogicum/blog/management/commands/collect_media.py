@@ -0,0 +1,51 @@
+import posixpath
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.images import referenced_images
+from blog.storage import image_storage
+
+
+class Command(BaseCommand):
+    help = 'Удаляет файлы изображений, на которые не ссылается ни один пост.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=60 * 60,
+            help='Не трогать файлы моложе стольких секунд.',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать, что будет удалено.',
+        )
+
+    def handle(self, *args, **options):
+        referenced = referenced_images()
+        threshold = timezone.now() - timedelta(seconds=options['min_age'])
+        removed = 0
+        for name in self.walk('images'):
+            if name in referenced:
+                continue
+            if image_storage.get_modified_time(name) > threshold:
+                continue
+            self.stdout.write(name)
+            if not options['dry_run']:
+                image_storage.delete(name)
+            removed += 1
+        self.stdout.write(
+            self.style.SUCCESS(f'Неиспользуемых файлов: {removed}')
+        )
+
+    def walk(self, path):
+        if not image_storage.exists(path):
+            return
+        directories, files = image_storage.listdir(path)
+        for filename in files:
+            yield posixpath.join(path, filename)
+        for directory in directories:
+            yield from self.walk(posixpath.join(path, directory))
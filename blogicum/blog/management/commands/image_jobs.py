@@ -0,0 +1,54 @@
+import statistics
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from blog.models import ImageJob
+
+
+class Command(BaseCommand):
+    help = 'Показывает очередь, задержку и ошибки обработки изображений.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--recent',
+            type=int,
+            default=100,
+            help='Сколько последних задач учитывать в задержке.',
+        )
+
+    def handle(self, *args, **options):
+        counts = dict(
+            ImageJob.objects.order_by().values_list('status').annotate(
+                total=Count('pk'))
+        )
+        for status, label in ImageJob.Status.choices:
+            self.stdout.write(f'{label}: {counts.get(status, 0)}')
+
+        oldest = ImageJob.objects.filter(
+            status=ImageJob.Status.PENDING
+        ).aggregate(oldest=Min('created_at'))['oldest']
+        if oldest:
+            age = (timezone.now() - oldest).total_seconds()
+            self.stdout.write(f'Старейшая задача ждёт: {age:.1f} с')
+
+        latencies = [
+            (finished_at - created_at).total_seconds()
+            for created_at, finished_at in ImageJob.objects.filter(
+                finished_at__isnull=False
+            ).order_by('-finished_at').values_list(
+                'created_at', 'finished_at')[:options['recent']]
+        ]
+        if latencies:
+            self.stdout.write(
+                f'Задержка, с: медиана {statistics.median(latencies):.2f}, '
+                f'максимум {max(latencies):.2f}'
+            )
+
+        for job in ImageJob.objects.filter(
+                status=ImageJob.Status.FAILED).order_by('-finished_at')[:10]:
+            last_line = job.error.strip().splitlines()[-1] if job.error else ''
+            self.stdout.write(
+                self.style.ERROR(f'Публикация {job.post_id}: {last_line}')
+            )
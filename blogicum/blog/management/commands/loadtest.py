@@ -0,0 +1,115 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.views import select_posts
+
+
+def percentile(durations, fraction):
+    ordered = sorted(durations)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def fetch(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(
+            f'GET {path} HTTP/1.1\r\nHost: {host}\r\n'
+            f'Connection: close\r\n\r\n'.encode()
+        )
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+    finally:
+        writer.close()
+    return int(status_line.split()[1])
+
+
+class Command(BaseCommand):
+    help = ('Нагружает запущенный сервер параллельными GET-запросами к '
+            'ленте, публикации, категории и профилю и печатает '
+            'пропускную способность и задержки.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths',
+            nargs='*',
+            help='Пути для запросов. По умолчанию берутся страницы '
+                 'последней опубликованной записи.',
+        )
+        parser.add_argument(
+            '--url',
+            default='http://127.0.0.1:8000',
+            help='Адрес сервера.',
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=1000,
+            help='Общее число запросов.',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=50,
+            help='Число одновременных запросов.',
+        )
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or self.default_paths()
+        url = urlsplit(options['url'])
+        durations, errors, elapsed = asyncio.run(self.run(
+            url.hostname, url.port or 80, paths,
+            options['requests'], options['concurrency'],
+        ))
+        if not durations:
+            raise CommandError('Ни один запрос не завершился успешно.')
+        self.stdout.write(
+            f'{len(durations)} запросов за {elapsed:.2f} с, '
+            f'{len(durations) / elapsed:.1f} запросов/с, ошибок: {errors}'
+        )
+        self.stdout.write(
+            f'p50 {statistics.median(durations) * 1000:.1f} мс, '
+            f'p95 {percentile(durations, 0.95) * 1000:.1f} мс'
+        )
+
+    @staticmethod
+    def default_paths():
+        post = select_posts().first()
+        if post is None:
+            raise CommandError('Нет опубликованных записей.')
+        return [
+            '/',
+            f'/posts/{post.pk}/',
+            f'/category/{post.category.slug}/',
+            f'/profile/{post.author.username}/',
+        ]
+
+    @staticmethod
+    async def run(host, port, paths, total, concurrency):
+        durations = []
+        errors = 0
+        queue = asyncio.Queue()
+        for number in range(total):
+            queue.put_nowait(paths[number % len(paths)])
+
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                path = queue.get_nowait()
+                started = time.perf_counter()
+                try:
+                    status = await fetch(host, port, path)
+                except (OSError, IndexError, ValueError):
+                    status = None
+                if status == 200:
+                    durations.append(time.perf_counter() - started)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return durations, errors, time.perf_counter() - started
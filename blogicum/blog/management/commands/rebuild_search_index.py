@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from blog.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = ('Заново строит полнотекстовый индекс публикаций в SQLite. '
+            'В PostgreSQL вектор поиска обновляется базой сам.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Псевдоним базы данных.',
+        )
+
+    def handle(self, *args, **options):
+        rebuild_index(options['database'])
+        self.stdout.write(self.style.SUCCESS('Поисковый индекс перестроен.'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog.counters import recount_comments
+from blog.models import Comments, Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает поле comment_count у всех публикаций.'
+
+    def handle(self, *args, **options):
+        updated = recount_comments(Post, Comments)
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано публикаций: {updated}')
+        )
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.tasks import run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = 'Обрабатывает очередь уменьшенных копий изображений.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Обработать текущую очередь и завершиться.',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=1.0,
+            help='Пауза между опросами пустой очереди, в секундах.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = run_pending_jobs()
+            if processed:
+                self.stdout.write(f'Обработано задач: {processed}')
+            if options['once']:
+                break
+            time.sleep(options['sleep'])
@@ -0,0 +1,134 @@
+import random
+import statistics
+import threading
+import time
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    OperationalError,
+    close_old_connections,
+    connections,
+)
+
+from blog.const import POSTS_PER_PAGE
+from blog.models import Comments
+from blog.views import select_posts
+
+from .loadtest import percentile
+
+BENCHMARK_TEXT = 'Комментарий нагрузочного теста'
+
+
+class Command(BaseCommand):
+    help = ('Нагружает базу из нескольких потоков смесью записи '
+            'комментариев и чтения ленты, как это делают запросы, и '
+            'печатает пропускную способность, задержки и число ошибок '
+            '«database is locked». Пишет в настроенную базу, поэтому '
+            'запускайте на копии; свои комментарии команда удаляет.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=8,
+            help='Число параллельных потоков.',
+        )
+        parser.add_argument(
+            '--operations',
+            type=int,
+            default=2000,
+            help='Общее число операций.',
+        )
+        parser.add_argument(
+            '--write-ratio',
+            type=float,
+            default=0.2,
+            help='Доля операций записи.',
+        )
+        parser.add_argument(
+            '--baseline',
+            action='store_true',
+            help='Настройки SQLite по умолчанию: без прагм, без '
+                 'постоянных подключений, с отложенными транзакциями.',
+        )
+
+    def handle(self, *args, **options):
+        post_ids = list(select_posts().values_list('pk', flat=True)[:1000])
+        author = get_user_model().objects.order_by('pk').first()
+        if not post_ids or author is None:
+            raise CommandError('Нужны пользователь и опубликованные записи.')
+        if options['baseline']:
+            connections[DEFAULT_DB_ALIAS].close()
+            database = connections.settings[DEFAULT_DB_ALIAS]
+            database['OPTIONS'] = {}
+            database['CONN_MAX_AGE'] = 0
+            # Режим журнала хранится в самом файле базы.
+            with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode=DELETE')
+
+        self.durations = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.lock = threading.Lock()
+        operations = iter(range(options['operations']))
+        threads = [
+            threading.Thread(target=self.worker, args=(
+                operations, options['write_ratio'], post_ids, author,
+            ))
+            for _ in range(options['threads'])
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.report(time.perf_counter() - started)
+        Comments.objects.filter(text=BENCHMARK_TEXT).delete()
+
+    def worker(self, operations, write_ratio, post_ids, author):
+        while True:
+            with self.lock:
+                if next(operations, None) is None:
+                    break
+            kind = 'write' if random.random() < write_ratio else 'read'
+            started = time.perf_counter()
+            try:
+                if kind == 'write':
+                    Comments.objects.create(
+                        post_id=random.choice(post_ids),
+                        author=author,
+                        text=BENCHMARK_TEXT,
+                    )
+                else:
+                    list(select_posts()[:POSTS_PER_PAGE])
+            except OperationalError:
+                with self.lock:
+                    self.errors[kind] += 1
+            else:
+                with self.lock:
+                    self.durations[kind].append(
+                        time.perf_counter() - started)
+            finally:
+                # Как в конце запроса: без CONN_MAX_AGE подключение
+                # закрывается, иначе переиспользуется.
+                close_old_connections()
+        connections.close_all()
+
+    def report(self, elapsed):
+        done = sum(len(values) for values in self.durations.values())
+        self.stdout.write(
+            f'{done} операций за {elapsed:.2f} с, '
+            f'{done / elapsed:.1f} операций/с'
+        )
+        for kind in ('read', 'write'):
+            values = self.durations[kind]
+            line = f'{kind}: {len(values)}'
+            if values:
+                line += (
+                    f', p50 {statistics.median(values) * 1000:.1f} мс'
+                    f', p95 {percentile(values, 0.95) * 1000:.1f} мс'
+                )
+            self.stdout.write(
+                f'{line}, database is locked: {self.errors[kind]}')
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:21
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fill_comment_count(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Comments = apps.get_model('blog', 'Comments')
+    comments = Comments.objects.filter(
+        post=models.OuterRef('pk')
+    ).order_by().values('post').annotate(
+        total=models.Count('pk')).values('total')
+    Post.objects.update(
+        comment_count=Coalesce(models.Subquery(comments), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_post_comment_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество комментариев'),
+        ),
+        migrations.RunPython(fill_comment_count, migrations.RunPython.noop),
+    ]
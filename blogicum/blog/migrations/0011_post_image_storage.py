@@ -0,0 +1,19 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:33
+
+import blog.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_imagejob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(blank=True, storage=blog.storage.ContentAddressedStorage(), upload_to='images/', verbose_name='Изображение'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+MODELS = ('category', 'location', 'post', 'comments')
+
+
+def copy_created_at(apps, schema_editor):
+    for model_name in MODELS:
+        apps.get_model('blog', model_name).objects.update(
+            updated_at=models.F('created_at')
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_post_image_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Изменено'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Изменено'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Изменено'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='comments',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Дата и время изменения'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['updated_at'], name='post_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comments',
+            index=models.Index(fields=['updated_at'], name='comment_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:20
+
+from django.db import migrations
+
+# Значения на момент миграции: код приложения может измениться позже.
+SEARCH_CONFIG = 'russian'
+FTS_TABLE = 'blog_post_fts'
+SEARCH_VECTOR_COLUMN = 'search_vector'
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f'ALTER TABLE blog_post ADD COLUMN {SEARCH_VECTOR_COLUMN} '
+            f'tsvector GENERATED ALWAYS AS ('
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', "
+            f"coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', "
+            f"coalesce(text, '')), 'B')) STORED"
+        )
+        schema_editor.execute(
+            f'CREATE INDEX post_search_idx ON blog_post '
+            f'USING GIN ({SEARCH_VECTOR_COLUMN})'
+        )
+        return
+    schema_editor.execute(
+        f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5('
+        f"title, text, tokenize='unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute(
+        f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+        f'SELECT id, title, text FROM blog_post'
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            f'ALTER TABLE blog_post DROP COLUMN {SEARCH_VECTOR_COLUMN}'
+        )
+        return
+    schema_editor.execute(f'DROP TABLE {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
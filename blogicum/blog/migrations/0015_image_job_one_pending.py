@@ -0,0 +1,27 @@
+# Generated by Django 5.1.1 on 2026-10-18 05:24
+
+from django.db import migrations, models
+
+
+def drop_duplicate_pending_jobs(apps, schema_editor):
+    ImageJob = apps.get_model('blog', 'ImageJob')
+    pending = ImageJob.objects.filter(status='pending')
+    first_jobs = pending.values('post').annotate(first=models.Min('pk'))
+    pending.exclude(pk__in=[job['first'] for job in first_jobs]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_admin_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            drop_duplicate_pending_jobs, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='imagejob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'pending')), fields=('post',), name='image_job_one_pending_per_post'),
+        ),
+    ]
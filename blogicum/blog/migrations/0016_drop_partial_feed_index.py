@@ -0,0 +1,17 @@
+# Generated by Django 5.1.1 on 2026-10-18 05:25
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_image_job_one_pending'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_published_feed_idx',
+        ),
+    ]
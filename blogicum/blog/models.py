@@ -1,21 +1,47 @@
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils import timezone
 
 from .const import MAX_LENGTH
+from .storage import image_storage
 
 
 User = get_user_model()
 
 
+class UpdatedAtQuerySet(models.QuerySet):
+    """QuerySet, обновляющий ``updated_at`` и при массовых изменениях.
+
+    ``auto_now`` срабатывает только в ``save()``, поэтому ``update()``
+    из действий админки и счётчиков проставляет время сам.
+    """
+
+    def update(self, **kwargs):
+        kwargs.setdefault('updated_at', timezone.now())
+        return super().update(**kwargs)
+
+    update.alters_data = True
+
+    def touch(self):
+        return self.update()
+
+    touch.alters_data = True
+
+
 class CreatedAtIsPublishedModel(models.Model):
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name='Добавлено')
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Изменено')
     is_published = models.BooleanField(
         default=True,
         verbose_name='Опубликовано',
         help_text='Снимите галочку, чтобы скрыть публикацию.')
 
+    objects = UpdatedAtQuerySet.as_manager()
+
     class Meta:
         abstract = True
 
@@ -67,7 +93,11 @@ class Post(CreatedAtIsPublishedModel):
     )
     image = models.ImageField(
         verbose_name='Изображение',
-        blank=True, upload_to='images/')
+        blank=True, upload_to='images/', storage=image_storage)
+    image_variants = models.JSONField(
+        default=dict,
+        editable=False,
+        verbose_name='Уменьшенные копии изображения')
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -83,12 +113,35 @@ class Post(CreatedAtIsPublishedModel):
         on_delete=models.SET_NULL,
         null=True,
         verbose_name='Категория')
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев')
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         default_related_name = 'posts'
         ordering = ('-pub_date',)
+        indexes = [
+            models.Index(
+                fields=['category', '-pub_date', '-id'],
+                condition=models.Q(is_published=True),
+                name='post_published_category_idx',
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='post_author_feed_idx',
+            ),
+            models.Index(
+                fields=['-pub_date', '-id'],
+                name='post_pub_date_idx',
+            ),
+            models.Index(
+                fields=['updated_at'],
+                name='post_updated_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.title[:10]
@@ -105,17 +158,94 @@ class Comments(models.Model):
         auto_now_add=True,
         verbose_name='Дата и время создания'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата и время изменения'
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
         verbose_name='Автор комментария'
     )
 
+    objects = UpdatedAtQuerySet.as_manager()
+
     class Meta:
         ordering = ('created_at',)
+        indexes = [
+            models.Index(
+                fields=['post', 'created_at'],
+                name='comment_post_created_idx',
+            ),
+            models.Index(
+                fields=['created_at', 'id'],
+                name='comment_created_idx',
+            ),
+            models.Index(
+                fields=['updated_at'],
+                name='comment_updated_idx',
+            ),
+        ]
         verbose_name = 'комментарий'
         verbose_name_plural = 'комментарии'
         default_related_name = 'comments'
 
     def __str__(self):
         return self.text[:10]
+
+
+class ImageJob(models.Model):
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'В очереди'
+        RUNNING = 'running', 'Выполняется'
+        DONE = 'done', 'Готово'
+        FAILED = 'failed', 'Ошибка'
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='image_jobs',
+        verbose_name='Публикация'
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name='Статус'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Поставлено в очередь'
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Начато'
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Завершено'
+    )
+    error = models.TextField(blank=True, verbose_name='Ошибка')
+
+    class Meta:
+        ordering = ('created_at',)
+        indexes = [
+            models.Index(
+                fields=['status', 'created_at'],
+                name='image_job_queue_idx',
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['post'],
+                condition=models.Q(status='pending'),
+                name='image_job_one_pending_per_post',
+            ),
+        ]
+        verbose_name = 'обработка изображения'
+        verbose_name_plural = 'Обработка изображений'
+
+    def __str__(self):
+        return f'{self.post_id}: {self.status}'
@@ -0,0 +1,193 @@
+import base64
+import binascii
+import collections.abc
+from datetime import datetime
+
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from .const import ESTIMATED_COUNT_THRESHOLD
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(obj, key):
+    raw = f'{getattr(obj, key).isoformat()}|{obj.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, pk = base64.urlsafe_b64decode(padded).decode().split('|')
+        return datetime.fromisoformat(value), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as error:
+        raise InvalidCursor(cursor) from error
+
+
+class KeysetPaginator:
+    """Пагинация по ключу (key, id) без COUNT(*) и OFFSET.
+
+    Страница выбирается одним диапазонным запросом по индексу:
+    курсор ``after`` ведёт дальше по ленте, ``before`` — назад.
+    По умолчанию лента идёт от новых публикаций к старым.
+    """
+
+    is_keyset = True
+
+    def __init__(self, object_list, per_page, key='pub_date',
+                 descending=True):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.key = key
+        self.descending = descending
+
+    def get_page(self, after=None, before=None):
+        queryset, make_page = self._page_query(after, before)
+        return make_page(list(queryset))
+
+    async def aget_page(self, after=None, before=None):
+        queryset, make_page = self._page_query(after, before)
+        return make_page([row async for row in queryset])
+
+    def _page_query(self, after, before):
+        """Запрос строк страницы и функция, собирающая из них страницу."""
+        try:
+            if before:
+                return self._page_before(*decode_cursor(before))
+            if after:
+                return self._page_after(*decode_cursor(after))
+        except InvalidCursor:
+            pass
+        return self._page_after()
+
+    def _ordered(self, forward):
+        prefix = '-' if forward == self.descending else ''
+        return self.object_list.order_by(prefix + self.key, prefix + 'pk')
+
+    def _seek(self, queryset, forward, value, pk):
+        lookup = 'lt' if forward == self.descending else 'gt'
+        return queryset.filter(
+            Q(**{f'{self.key}__{lookup}': value})
+            | Q(**{self.key: value, f'pk__{lookup}': pk})
+        )
+
+    def _page_after(self, value=None, pk=None):
+        queryset = self._ordered(forward=True)
+        if value is not None:
+            queryset = self._seek(queryset, True, value, pk)
+
+        def make_page(rows):
+            return KeysetPage(
+                rows[:self.per_page],
+                self,
+                has_next=len(rows) > self.per_page,
+                has_previous=value is not None,
+            )
+        return queryset[:self.per_page + 1], make_page
+
+    def _page_before(self, value, pk):
+        queryset = self._seek(
+            self._ordered(forward=False), False, value, pk)
+
+        def make_page(rows):
+            return KeysetPage(
+                rows[:self.per_page][::-1],
+                self,
+                has_next=True,
+                has_previous=len(rows) > self.per_page,
+            )
+        return queryset[:self.per_page + 1], make_page
+
+
+class KeysetPage(collections.abc.Sequence):
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<KeysetPage of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next and bool(self.object_list)
+
+    def has_previous(self):
+        return self._has_previous and bool(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def next_cursor(self):
+        if not self.has_next():
+            return ''
+        return encode_cursor(self.object_list[-1], self.paginator.key)
+
+    def previous_cursor(self):
+        if not self.has_previous():
+            return ''
+        return encode_cursor(self.object_list[0], self.paginator.key)
+
+
+def estimate_count(model, using='default'):
+    """Оценка числа строк таблицы по статистике планировщика или None.
+
+    В PostgreSQL это ``pg_class.reltuples``, в SQLite — ``sqlite_stat1``,
+    который заполняет ``ANALYZE``. Там по строке на индекс, и первое
+    число в ней — строки индекса: у частичного индекса их меньше, чем
+    в таблице, поэтому берётся наибольшее.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class '
+                    'WHERE oid = %s::regclass',
+                    [connection.ops.quote_name(table)],
+                )
+            elif connection.vendor == 'sqlite':
+                cursor.execute(
+                    'SELECT stat FROM sqlite_stat1 WHERE tbl = %s',
+                    [table],
+                )
+            else:
+                return None
+            rows = cursor.fetchall()
+    except DatabaseError:
+        return None
+    if not rows:
+        return None
+    estimate = max(int(str(stat).split()[0]) for stat, in rows)
+    return estimate if estimate >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator, не считающий COUNT(*) по всей большой таблице.
+
+    Для выборки без условий число строк берётся из статистики,
+    если таблица больше ``ESTIMATED_COUNT_THRESHOLD``; отфильтрованные
+    выборки считаются точно.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
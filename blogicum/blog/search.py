@@ -0,0 +1,138 @@
+import re
+
+from django.db import connections
+from django.db.models import F, FloatField
+from django.db.models.expressions import RawSQL
+
+from .const import SEARCH_CONFIG
+
+FTS_TABLE = 'blog_post_fts'
+SEARCH_VECTOR_COLUMN = 'search_vector'
+WORD = re.compile(r'\w+')
+# Окончания для грубого стемминга в SQLite: у FTS5 нет русского
+# стеммера, поэтому основа слова ищется как префикс.
+RUSSIAN_ENDINGS = sorted((
+    'иями', 'ями', 'ами', 'ией', 'иях', 'ого', 'его', 'ому', 'ему',
+    'ыми', 'ими', 'ться', 'ть', 'ет', 'ит', 'ют', 'ят', 'ат',
+    'ая', 'яя', 'ое', 'ее', 'ые', 'ие', 'ый', 'ий', 'ой', 'ей',
+    'ам', 'ям', 'ах', 'ях', 'ом', 'ем', 'ов', 'ев', 'ую', 'юю',
+    'а', 'я', 'о', 'е', 'ы', 'и', 'у', 'ю', 'ь', 'й',
+), key=len, reverse=True)
+MIN_STEM_LENGTH = 3
+
+
+def stem(word):
+    for ending in RUSSIAN_ENDINGS:
+        if (word.endswith(ending)
+                and len(word) - len(ending) >= MIN_STEM_LENGTH):
+            return word[:-len(ending)]
+    return word
+
+
+def fts5_query(query):
+    """Переводит пользовательский запрос в безопасный запрос FTS5.
+
+    Каждое слово становится префиксом своей основы в кавычках,
+    так что операторы FTS5 из ввода не исполняются.
+    """
+    return ' '.join(
+        f'"{stem(word)}"*' for word in WORD.findall(query.lower())
+    )
+
+
+def is_postgresql(using):
+    return connections[using].vendor == 'postgresql'
+
+
+def index_post(post, using='default'):
+    """Обновляет запись публикации в индексе FTS5.
+
+    В PostgreSQL вектор — вычисляемый столбец и обновляется сам.
+    """
+    if is_postgresql(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post.pk]
+        )
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+            f'VALUES (%s, %s, %s)',
+            [post.pk, post.title, post.text],
+        )
+
+
+def unindex_post(post_pk, using='default'):
+    if is_postgresql(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_pk]
+        )
+
+
+def rebuild_index(using='default'):
+    """Заново заполняет индекс FTS5 из таблицы публикаций."""
+    if is_postgresql(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, text) '
+            f'SELECT id, title, text FROM blog_post'
+        )
+
+
+def match_posts(posts, query):
+    """Отбирает публикации по запросу, не сортируя по релевантности."""
+    if is_postgresql(posts.db):
+        return _annotate_document(posts).filter(
+            document=_search_query(query)
+        )
+    match = fts5_query(query)
+    if not match:
+        return posts.none()
+    return posts.filter(
+        pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            (match,),
+        )
+    )
+
+
+def search_posts(posts, query):
+    """Отбирает публикации по полнотекстовому запросу.
+
+    Возвращает ``posts``, отсортированные по релевантности: совпадения
+    в заголовке весят больше, чем в тексте, при равенстве выше новые.
+    """
+    posts = match_posts(posts, query)
+    if is_postgresql(posts.db):
+        from django.contrib.postgres.search import SearchRank
+
+        rank = SearchRank(F('document'), _search_query(query))
+        return posts.annotate(rank=rank).order_by('-rank', '-pub_date', '-pk')
+    rank = RawSQL(
+        f'SELECT bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} '
+        f'WHERE {FTS_TABLE} MATCH %s AND rowid = blog_post.id',
+        (fts5_query(query),),
+        output_field=FloatField(),
+    )
+    return posts.annotate(rank=rank).order_by('rank', '-pub_date', '-pk')
+
+
+def _search_query(query):
+    from django.contrib.postgres.search import SearchQuery
+
+    return SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+
+
+def _annotate_document(posts):
+    from django.contrib.postgres.search import SearchVectorField
+
+    return posts.annotate(
+        document=RawSQL(
+            f'"blog_post"."{SEARCH_VECTOR_COLUMN}"', (),
+            output_field=SearchVectorField(),
+        ),
+    )
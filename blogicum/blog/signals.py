@@ -0,0 +1,257 @@
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from .cache import (
+    invalidate_feeds,
+    invalidate_next_publication,
+    invalidate_post_cards,
+)
+from .images import release_image
+from .models import Category, Comments, Location, Post
+from .search import index_post, unindex_post
+
+# Поля связанных моделей, которые видны на страницах публикаций.
+POST_PAGE_FIELDS = {
+    'blog.Category': ('title', 'slug', 'is_published'),
+    'blog.Location': ('name', 'is_published'),
+    settings.AUTH_USER_MODEL: ('username',),
+}
+# Поля, которые видны только на собственной странице категории или
+# профиля: их правка сбрасывает одну эту ленту.
+OWN_PAGE_FIELDS = {
+    'blog.Category': ('description',),
+    'blog.Location': (),
+    settings.AUTH_USER_MODEL: ('first_name', 'last_name', 'is_staff'),
+}
+
+
+def after_commit(invalidate, *args, **kwargs):
+    """Сбрасывает кэш только после фиксации транзакции.
+
+    Сброс внутри транзакции даёт читателю между ним и COMMIT собрать
+    страницу из старых данных и положить её под новую версию.
+    """
+    transaction.on_commit(partial(invalidate, *args, **kwargs))
+
+
+def invalidate_post_feeds(category_ids, author_ids):
+    invalidate_feeds(
+        Category.objects.filter(pk__in=category_ids).values_list(
+            'slug', flat=True),
+        get_user_model().objects.filter(pk__in=author_ids).values_list(
+            'username', flat=True),
+    )
+
+
+def invalidate_comment_feeds(comment):
+    post = Post.objects.filter(pk=comment.post_id)
+    invalidate_post_feeds(
+        post.values('category_id'), post.values('author_id')
+    )
+
+
+@receiver(post_save, sender=Comments)
+def increment_comment_count(sender, instance, created, **kwargs):
+    after_commit(invalidate_post_cards, [instance.post_id])
+    if not created:
+        Post.objects.filter(pk=instance.post_id).touch()
+        return
+    Post.objects.filter(pk=instance.post_id).update(
+        comment_count=F('comment_count') + 1
+    )
+    after_commit(invalidate_comment_feeds, instance)
+
+
+@receiver(post_delete, sender=Comments)
+def decrement_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1
+    )
+    after_commit(invalidate_post_cards, [instance.post_id])
+    after_commit(invalidate_comment_feeds, instance)
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_post_state(sender, instance, update_fields=None,
+                                 **kwargs):
+    previous = Post.objects.filter(pk=instance.pk).values(
+        'category_id', 'image', 'image_variants').first() or {}
+    instance._previous_category_id = previous.get('category_id')
+    instance._previous_image = None
+    # Устаревший экземпляр, сохраняющий другие поля, не должен
+    # счесть загруженное позже изображение заменённым и удалить его.
+    if update_fields is not None and 'image' not in update_fields:
+        return
+    if previous.get('image'):
+        instance._previous_image = (
+            previous['image'], previous['image_variants']
+        )
+
+
+def release_replaced_image(instance):
+    """Освобождает прежнее изображение, если публикация сменила его.
+
+    Сравнивать имена можно только после сохранения: до него у новой
+    загрузки ещё исходное имя, а не имя по хешу содержимого, и та же
+    картинка, загруженная заново, выглядела бы заменой.
+    """
+    previous = getattr(instance, '_previous_image', None)
+    if not previous or previous[0] == instance.image.name:
+        return
+    if instance.image_variants:
+        Post.objects.filter(pk=instance.pk).update(image_variants={})
+        instance.image_variants = {}
+    after_commit(release_image, *previous, post_pk=instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def invalidate_post_card(sender, instance, **kwargs):
+    release_replaced_image(instance)
+    after_commit(invalidate_post_cards, [instance.pk])
+    after_commit(invalidate_next_publication)
+    after_commit(
+        invalidate_post_feeds,
+        [instance.category_id, getattr(instance, '_previous_category_id',
+                                       None)],
+        [instance.author_id],
+    )
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_deleted_post_feeds(sender, instance, **kwargs):
+    after_commit(release_image, instance.image.name, instance.image_variants)
+    after_commit(invalidate_next_publication)
+    after_commit(
+        invalidate_post_feeds, [instance.category_id], [instance.author_id])
+
+
+@receiver(post_save, sender=Post)
+def update_search_index(sender, instance, using, update_fields=None,
+                        **kwargs):
+    if update_fields and not {'title', 'text'} & set(update_fields):
+        return
+    index_post(instance, using)
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_search_index(sender, instance, using, **kwargs):
+    unindex_post(instance.pk, using)
+
+
+def changed_fields(instance):
+    """Поля из запомненных в pre_save, значение которых изменилось."""
+    previous = getattr(instance, '_previous_fields', None) or {}
+    return {
+        name for name, value in previous.items()
+        if getattr(instance, name) != value
+    }
+
+
+def own_feeds(instance):
+    """Лента категории или профиля, под старым и новым именем."""
+    previous = getattr(instance, '_previous_fields', None) or {}
+    if isinstance(instance, Category):
+        return {'category_slugs': {
+            instance.slug, previous.get('slug', instance.slug)}}
+    if isinstance(instance, Location):
+        return {}
+    return {'usernames': {
+        instance.username, previous.get('username', instance.username)}}
+
+
+def related_post_feeds(instance):
+    """Ленты, где видны публикации записи, включая её собственную."""
+    posts = instance.posts.all()
+    feeds = {
+        'category_slugs': set(posts.exclude(category=None).values_list(
+            'category__slug', flat=True)),
+        'usernames': set(posts.values_list('author__username', flat=True)),
+    }
+    for name, values in own_feeds(instance).items():
+        feeds[name] |= values
+    return feeds
+
+
+def displayed_posts(instance):
+    """Публикации, на страницах которых видна запись.
+
+    Имя пользователя показано и у его публикаций, и у его комментариев.
+    """
+    if isinstance(instance, (Category, Location)):
+        return instance.posts.all()
+    return Post.objects.filter(
+        Q(author=instance)
+        | Q(pk__in=Comments.objects.filter(author=instance).values('post'))
+    )
+
+
+@receiver(pre_save, sender=Category)
+@receiver(pre_save, sender=Location)
+@receiver(pre_save, sender=settings.AUTH_USER_MODEL)
+def remember_previous_fields(sender, instance, update_fields=None,
+                             **kwargs):
+    label = sender._meta.label
+    fields = POST_PAGE_FIELDS[label] + OWN_PAGE_FIELDS[label]
+    if update_fields is not None:
+        fields = [name for name in fields if name in update_fields]
+    instance._previous_fields = None
+    if fields and instance.pk:
+        instance._previous_fields = sender._default_manager.filter(
+            pk=instance.pk).values(*fields).first()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_related_post_cards(sender, instance, created, **kwargs):
+    """Сбрасывает только те ленты, где видны изменившиеся поля.
+
+    У новой записи ещё нет публикаций и страниц в кэше.
+    """
+    if created:
+        return
+    label = sender._meta.label
+    changed = changed_fields(instance)
+    if changed & set(POST_PAGE_FIELDS[label]):
+        posts = displayed_posts(instance)
+        after_commit(invalidate_post_cards,
+                     list(posts.values_list('pk', flat=True)))
+        posts.touch()
+        after_commit(invalidate_feeds, **related_post_feeds(instance))
+    elif changed & set(OWN_PAGE_FIELDS[label]):
+        after_commit(invalidate_feeds, index=False, **own_feeds(instance))
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Location)
+def remember_deleted_related_posts(sender, instance, **kwargs):
+    """Запоминает публикации до того, как SET_NULL отвяжет их.
+
+    Поле обнуляется запросом без сигналов, поэтому карточки и ленты
+    с этими публикациями сбрасываются здесь, а не в сигналах Post.
+    """
+    instance._previous_fields = None
+    instance._related_posts = (
+        list(instance.posts.values_list('pk', flat=True)),
+        related_post_feeds(instance),
+    )
+    instance.posts.touch()
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Location)
+def invalidate_deleted_related_posts(sender, instance, **kwargs):
+    post_pks, feeds = instance._related_posts
+    after_commit(invalidate_post_cards, post_pks)
+    after_commit(invalidate_feeds, **feeds)
@@ -0,0 +1,41 @@
+import hashlib
+import posixpath
+
+from django.core.files.base import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранилище, называющее файлы по SHA-256 содержимого.
+
+    Одинаковые загрузки попадают в один файл, а имя файла меняется
+    только вместе с содержимым, поэтому его можно кэшировать навсегда.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('allow_overwrite', True)
+        super().__init__(**kwargs)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        hexdigest = digest.hexdigest()
+        directory, filename = posixpath.split(name)
+        extension = posixpath.splitext(filename)[1].lower()
+        name = posixpath.join(
+            directory, hexdigest[:2], f'{hexdigest}{extension}'
+        )
+        if self.exists(name):
+            return name
+        return super().save(name, content, max_length=max_length)
+
+
+image_storage = ContentAddressedStorage()
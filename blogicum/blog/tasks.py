@@ -0,0 +1,77 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .const import IMAGE_JOB_TIMEOUT
+from .images import build_image_variants
+from .models import ImageJob
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_image_variants(post):
+    """Ставит сборку копий изображения в очередь, не дублируя задачи.
+
+    Вторую задачу в очереди для той же публикации не даёт создать
+    условный уникальный индекс.
+    """
+    if not post.image:
+        return
+    try:
+        with transaction.atomic():
+            ImageJob.objects.create(post=post)
+    except IntegrityError:
+        pass
+
+
+def claim_next_job():
+    """Забирает старейшую задачу из очереди или возвращает None.
+
+    Задача переводится в RUNNING условным UPDATE, поэтому несколько
+    воркеров не возьмут одну и ту же задачу. Задачи, выполняющиеся
+    дольше IMAGE_JOB_TIMEOUT, остались от упавших воркеров и
+    забираются заново.
+    """
+    now = timezone.now()
+    claimable = ImageJob.objects.filter(
+        Q(status=ImageJob.Status.PENDING)
+        | Q(status=ImageJob.Status.RUNNING,
+            started_at__lt=now - timedelta(seconds=IMAGE_JOB_TIMEOUT))
+    )
+    for job in claimable.order_by('created_at')[:10]:
+        claimed = claimable.filter(pk=job.pk).update(
+            status=ImageJob.Status.RUNNING, started_at=now
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+    return None
+
+
+def run_job(job):
+    try:
+        build_image_variants(job.post)
+    except Exception:
+        logger.exception('Image job %s failed', job.pk)
+        job.status = ImageJob.Status.FAILED
+        job.error = traceback.format_exc()
+    else:
+        job.status = ImageJob.Status.DONE
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'finished_at'])
+    return job
+
+
+def run_pending_jobs(limit=None):
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_next_job()
+        if job is None:
+            break
+        run_job(job)
+        processed += 1
+    return processed
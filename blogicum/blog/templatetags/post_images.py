@@ -0,0 +1,28 @@
+from django import template
+
+from blog.const import IMAGE_VARIANTS
+
+register = template.Library()
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post, variant):
+    """Картинка публикации с srcset из копий не крупнее ``variant``."""
+    variants = post.image_variants
+    if variant not in variants:
+        return {'src': post.image.url}
+    storage = post.image.storage
+    sizes = list(IMAGE_VARIANTS)[:list(IMAGE_VARIANTS).index(variant) + 1]
+    srcset = {}
+    for name in sizes:
+        srcset.setdefault(
+            variants[name]['width'], storage.url(variants[name]['name'])
+        )
+    return {
+        'src': storage.url(variants[variant]['name']),
+        'srcset': ', '.join(
+            f'{url} {width}w' for width, url in srcset.items()
+        ),
+        'width': variants[variant]['width'],
+        'height': variants[variant]['height'],
+    }
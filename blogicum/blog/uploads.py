@@ -0,0 +1,33 @@
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+
+from .const import IMAGE_MAX_UPLOAD_SIZE
+
+
+class LimitedTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """Пишет загрузку на диск по частям, не держа её в памяти.
+
+    Всё, что сверх ``max_size``, отбрасывается прямо при чтении потока,
+    а файл помечается ``oversized`` — форма отклонит его без декодирования.
+    """
+
+    max_size = IMAGE_MAX_UPLOAD_SIZE
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+        self.oversized = bool(
+            self.content_length and self.content_length > self.max_size
+        )
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > self.max_size:
+            self.oversized = True
+        if self.oversized:
+            return None
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        uploaded.oversized = self.oversized
+        return uploaded
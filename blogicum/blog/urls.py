@@ -6,9 +6,13 @@ app_name = 'blog'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('search/', views.search, name='search'),
     path('posts/<int:post_pk>/',
          views.post_detail,
          name='post_detail'),
+    path('posts/<int:post_pk>/comments/',
+         views.post_comments,
+         name='post_comments'),
     path('posts/create/',
          views.create_post,
          name='create_post'),
@@ -1,25 +1,70 @@
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.core.paginator import Paginator
-from django.db.models import Count
-from django.shortcuts import get_object_or_404, redirect, render
+from django.db import transaction
+from django.shortcuts import (
+    aget_object_or_404,
+    get_object_or_404,
+    redirect,
+    render,
+)
 from django.utils import timezone
 
-from .const import POSTS_PER_PAGE
+from .cache import (
+    CATEGORY_FEED,
+    INDEX_FEED,
+    PROFILE_FEED,
+    aattach_post_card_versions,
+    acondition,
+    attach_post_card_versions,
+    cache_feed_page,
+    feed_etag,
+    post_etag,
+    post_last_modified,
+)
+from .const import COMMENTS_PER_PAGE, POSTS_PER_PAGE
 from .forms import CreateComments, CreatePost, UserForm
 from .models import Category, Comments, Post
+from .paginator import KeysetPaginator
+from .search import search_posts
+from .tasks import enqueue_image_variants
 
 
-def pagination(posts, request, posts_per_page=POSTS_PER_PAGE):
-    return Paginator(posts, posts_per_page).get_page(
-        request.GET.get('page')
-    )
+def pagination(posts, request, posts_per_page=POSTS_PER_PAGE, keyset=None):
+    if keyset is None:
+        keyset = settings.BLOG_KEYSET_PAGINATION
+    if keyset:
+        page = KeysetPaginator(posts, posts_per_page).get_page(
+            after=request.GET.get('after'),
+            before=request.GET.get('before'),
+        )
+    else:
+        page = Paginator(posts, posts_per_page).get_page(
+            request.GET.get('page')
+        )
+    page.object_list = attach_post_card_versions(list(page.object_list))
+    return page
+
+
+async def apagination(posts, request, posts_per_page=POSTS_PER_PAGE):
+    if settings.BLOG_KEYSET_PAGINATION:
+        page = await KeysetPaginator(posts, posts_per_page).aget_page(
+            after=request.GET.get('after'),
+            before=request.GET.get('before'),
+        )
+    else:
+        paginator = Paginator(posts, posts_per_page)
+        paginator.count = await posts.acount()
+        page = paginator.get_page(request.GET.get('page'))
+        page.object_list = [post async for post in page.object_list]
+    page.object_list = await aattach_post_card_versions(page.object_list)
+    return page
 
 
 def select_posts(posts=Post.objects.all(),
                  filter_posts=True,
-                 select_related_fields=True,
-                 annotate_comments=True):
+                 select_related_fields=True):
     if filter_posts:
         posts = posts.filter(
             is_published=True,
@@ -28,20 +73,18 @@ def select_posts(posts=Post.objects.all(),
         )
     if select_related_fields:
         posts = posts.select_related('author', 'location', 'category')
-    if annotate_comments:
-        posts = posts.annotate(
-            comment_count=Count('comments')).order_by(*Post._meta.ordering)
     return posts
 
 
-def profile(request, username):
-    author = get_object_or_404(User, username=username)
+@acondition(etag_func=feed_etag(PROFILE_FEED))
+async def profile(request, username):
+    author = await aget_object_or_404(User, username=username)
     posts = select_posts(
         author.posts,
         filter_posts=author.username != request.user.username)
     context = {
         'profile': author,
-        'page_obj': pagination(posts, request),
+        'page_obj': await apagination(posts, request),
     }
     return render(request, 'blog/profile.html', context)
 
@@ -58,38 +101,93 @@ def edit_profile(request, username):
     return render(request, 'blog/user.html', context)
 
 
-def index(request):
+@cache_feed_page(INDEX_FEED)
+async def index(request):
     posts = select_posts()
-    context = {'page_obj': pagination(posts, request)}
+    context = {'page_obj': await apagination(posts, request)}
     return render(request, 'blog/index.html', context)
 
 
-def post_detail(request, post_pk):
-    post = get_object_or_404(Post, pk=post_pk)
-    if post.author.username == request.user.username:
-        post = post
-    else:
+def search(request):
+    query = request.GET.get('q', '').strip()
+    posts = Post.objects.none()
+    if query:
+        posts = search_posts(select_posts(), query)
+    context = {
+        'search_query': query,
+        'page_obj': pagination(posts, request, keyset=False),
+    }
+    return render(request, 'blog/search.html', context)
+
+
+def get_visible_post(request, post_pk):
+    post = select_posts().filter(pk=post_pk).first()
+    if post is None:
         post = get_object_or_404(
-            select_posts(select_related_fields=False, annotate_comments=False),
-            pk=post_pk
+            select_posts(filter_posts=False),
+            pk=post_pk,
+            author__username=request.user.username,
         )
+    return post
+
+
+async def aget_visible_post(request, post_pk):
+    post = await select_posts().filter(pk=post_pk).afirst()
+    if post is None:
+        post = await aget_object_or_404(
+            select_posts(filter_posts=False),
+            pk=post_pk,
+            author__username=request.user.username,
+        )
+    return post
+
+
+def comments_paginator(post):
+    return KeysetPaginator(
+        post.comments.select_related('author'),
+        COMMENTS_PER_PAGE,
+        key='created_at',
+        descending=False,
+    )
+
+
+def paginate_comments(post, request):
+    return comments_paginator(post).get_page(after=request.GET.get('after'))
+
+
+@acondition(etag_func=post_etag, last_modified_func=post_last_modified)
+async def post_detail(request, post_pk):
+    post = await aget_visible_post(request, post_pk)
     context = {
         'post': post,
         'form': CreateComments(),
-        'comments': post.comments.all(),
+        'comments': await comments_paginator(post).aget_page(
+            after=request.GET.get('after')),
     }
     return render(request, 'blog/detail.html', context)
 
 
-def category_posts(request, category_slug):
-    category = get_object_or_404(
+def post_comments(request, post_pk):
+    post = get_visible_post(request, post_pk)
+    context = {
+        'post': post,
+        'comments': paginate_comments(post, request),
+        'only_comments': True,
+    }
+    return render(request, 'includes/comments.html', context)
+
+
+@acondition(etag_func=feed_etag(CATEGORY_FEED))
+@cache_feed_page(CATEGORY_FEED)
+async def category_posts(request, category_slug):
+    category = await aget_object_or_404(
         Category,
         slug=category_slug,
         is_published=True,
     )
     context = {
         'category': category,
-        'page_obj': pagination(select_posts(category.posts), request),
+        'page_obj': await apagination(select_posts(category.posts), request),
     }
     return render(request, 'blog/category.html', context)
 
@@ -103,6 +201,7 @@ def create_post(request):
     instance = form.save(commit=False)
     instance.author = request.user
     instance.save()
+    enqueue_image_variants(instance)
     return redirect('blog:profile', request.user.username)
 
 
@@ -119,6 +218,8 @@ def edit_post(request, post_pk):
     context = {'form': form, 'post': post}
     if form.is_valid():
         form.save()
+        if 'image' in form.changed_data:
+            enqueue_image_variants(post)
         return redirect('blog:post_detail', post.pk)
     return render(request, 'blog/create.html', context)
 
@@ -145,7 +246,8 @@ def add_comment(request, post_pk):
         comment = form.save(commit=False)
         comment.author = request.user
         comment.post = get_object_or_404(Post, pk=post_pk)
-        comment.save()
+        with transaction.atomic():
+            comment.save()
     return redirect('blog:post_detail', post_pk)
 
 
@@ -168,7 +270,8 @@ def delete_comment(request, post_pk, comment_pk):
     if request.user != comment.author:
         return redirect('blog:post_detail', post_pk)
     if request.method == 'POST':
-        comment.delete()
+        with transaction.atomic():
+            comment.delete()
         return redirect('blog:post_detail', post_pk)
     return render(
         request,
@@ -0,0 +1,44 @@
+import logging
+import time
+from pathlib import Path
+
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger('blogicum.templates')
+
+
+def template_names(directory):
+    directory = Path(directory)
+    return sorted(
+        path.relative_to(directory).as_posix()
+        for path in directory.rglob('*')
+        if path.is_file()
+    )
+
+
+def warm_up_templates():
+    """Компилирует все шаблоны из каталогов DIRS при старте воркера.
+
+    Скомпилированные шаблоны остаются в cached.Loader, поэтому первый
+    запрос воркера не разбирает шаблоны и теги django_bootstrap5.
+    Возвращает число скомпилированных шаблонов.
+    """
+    started = time.perf_counter()
+    compiled = 0
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        for directory in backend.engine.dirs:
+            for name in template_names(directory):
+                try:
+                    backend.get_template(name)
+                except TemplateSyntaxError:
+                    logger.exception('Шаблон %s не компилируется.', name)
+                else:
+                    compiled += 1
+    logger.info(
+        'Шаблоны скомпилированы: %d за %.1f мс.',
+        compiled, (time.perf_counter() - started) * 1000,
+    )
+    return compiled
@@ -0,0 +1,242 @@
+import json
+import logging
+import random
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.base import Template
+
+from .routers import (
+    PRIMARY_COOKIE,
+    RequestRouting,
+    current_routing,
+    choose_replica,
+)
+
+logger = logging.getLogger('blogicum.profiling')
+
+_current_profile = ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.templates = defaultdict(float)
+
+    def sql_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_count += 1
+            self.sql_time += time.perf_counter() - started
+
+
+def sql_timer(execute, sql, params, many, context):
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    return profile.sql_wrapper(execute, sql, params, many, context)
+
+
+def _add_sql_timer(sender=None, connection=None, **kwargs):
+    if sql_timer not in connection.execute_wrappers:
+        connection.execute_wrappers.append(sql_timer)
+
+
+def install_sql_timer():
+    """Ставит замер SQL на открытые подключения текущего потока.
+
+    Новые подключения получают его через сигнал connection_created.
+    Профиль берётся из контекста запроса, поэтому запросы асинхронных
+    представлений, которые ORM выполняет в отдельном потоке, тоже
+    попадают в профиль.
+    """
+    connection_created.connect(_add_sql_timer, dispatch_uid='sql_timer')
+    for connection in connections.all(initialized_only=True):
+        _add_sql_timer(connection=connection)
+
+
+def install_template_timer():
+    """Оборачивает Template._render, чтобы замерять время шаблонов.
+
+    Время шаблона включает вложенные в него include и родителя
+    из extends. Вне профилируемого запроса обёртка ничего не делает.
+    """
+    original_render = Template._render
+    if getattr(original_render, 'profiled', False):
+        return
+
+    def _render(self, context):
+        profile = _current_profile.get()
+        if profile is None:
+            return original_render(self, context)
+        started = time.perf_counter()
+        try:
+            return original_render(self, context)
+        finally:
+            profile.templates[self.name] += time.perf_counter() - started
+
+    _render.profiled = True
+    Template._render = _render
+
+
+class RequestProfilingMiddleware:
+    """Замеряет SQL, шаблоны и время ответа для доли запросов.
+
+    Доля задаётся настройкой PROFILING_SAMPLE_RATE (0 — выключено).
+    Результат отдаётся в заголовке Server-Timing и пишется в лог
+    ``blogicum.profiling`` одной JSON-строкой.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        if not self.sample_rate:
+            raise MiddlewareNotUsed
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        install_template_timer()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+        install_sql_timer()
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        return self.report(request, response, profile, started)
+
+    async def __acall__(self, request):
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+        await sync_to_async(install_sql_timer)()
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        return self.report(request, response, profile, started)
+
+    def report(self, request, response, profile, started):
+        total = time.perf_counter() - started
+        response['Server-Timing'] = self.server_timing(profile, total)
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'view': getattr(request.resolver_match, 'view_name', None),
+            'total_ms': round(total * 1000, 2),
+            'sql_count': profile.sql_count,
+            'sql_ms': round(profile.sql_time * 1000, 2),
+            'templates_ms': {
+                name: round(duration * 1000, 2)
+                for name, duration in profile.templates.items()
+            },
+        }, ensure_ascii=False))
+        return response
+
+    @staticmethod
+    def server_timing(profile, total):
+        metrics = [
+            f'sql;dur={profile.sql_time * 1000:.2f};'
+            f'desc="{profile.sql_count} queries"',
+        ]
+        metrics += [
+            f'tpl;dur={duration * 1000:.2f};desc="{name}"'
+            for name, duration in profile.templates.items()
+        ]
+        metrics.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(metrics)
+
+
+class ReplicaRoutingMiddleware:
+    """Направляет чтение страниц из REPLICA_VIEWS на реплики.
+
+    Запрос, который записал что-то в базу, ставит cookie, и следующие
+    REPLICA_STICKY_SECONDS секунд этот клиент читает только из основной
+    базы: так он сразу видит свой комментарий после редиректа, даже
+    если реплика отстаёт.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.views = frozenset(settings.REPLICA_VIEWS)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        routing = self.start(request)
+        token = current_routing.set(routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_routing.reset(token)
+        return self.finish(routing, response)
+
+    async def __acall__(self, request):
+        routing = self.start(request)
+        token = current_routing.set(routing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_routing.reset(token)
+        return self.finish(routing, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        routing = current_routing.get()
+        if routing is not None and request.resolver_match.view_name in (
+            self.views
+        ):
+            routing.replica = choose_replica()
+
+    @staticmethod
+    def start(request):
+        return RequestRouting(
+            pinned=(
+                PRIMARY_COOKIE in request.COOKIES
+                or request.method not in ('GET', 'HEAD')
+            ),
+        )
+
+    @staticmethod
+    def finish(routing, response):
+        if routing.wrote:
+            response.set_cookie(
+                PRIMARY_COOKIE,
+                '1',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
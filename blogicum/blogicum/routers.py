@@ -0,0 +1,71 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PRIMARY_COOKIE = 'use_primary_db'
+
+current_routing = ContextVar('request_routing', default=None)
+
+
+class RequestRouting:
+    """Куда читать в рамках одного запроса.
+
+    ``replica`` задаёт middleware для представлений из REPLICA_VIEWS;
+    ``wrote`` отмечает роутер, как только запрос что-то записал.
+    """
+
+    def __init__(self, pinned):
+        self.pinned = pinned
+        self.replica = None
+        self.wrote = False
+
+
+class ReplicaRouter:
+    """Читает с реплик в представлениях, которым это разрешено.
+
+    Вне запроса, в остальных представлениях и у клиентов, недавно
+    писавших в базу, все запросы идут в основную базу.
+    """
+
+    def db_for_read(self, model, **hints):
+        routing = current_routing.get()
+        if routing is None or routing.pinned or routing.wrote:
+            return None
+        return routing.replica
+
+    def db_for_write(self, model, **hints):
+        routing = current_routing.get()
+        if routing is not None:
+            routing.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+def choose_replica():
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+def reads_from_replica():
+    """Читает ли текущий запрос с реплики."""
+    routing = current_routing.get()
+    return (routing is not None and routing.replica is not None
+            and not routing.pinned and not routing.wrote)
+
+
+def use_primary():
+    """Переводит оставшиеся чтения запроса в основную базу.
+
+    Запрос, который заполнит общий кэш, должен читать из основной
+    базы: кэш сбрасывается сразу после COMMIT, и данные отстающей
+    реплики легли бы под новую версию до следующей правки.
+    """
+    routing = current_routing.get()
+    if routing is not None:
+        routing.pinned = True
@@ -0,0 +1,20 @@
+"""Настройки проекта.
+
+Профиль выбирается переменной окружения BLOGICUM_ENV: ``dev``
+(по умолчанию) или ``prod``. Остальные параметры развёртывания тоже
+берутся из окружения, см. deploy/blogicum.env.example.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+ENVIRONMENT = os.environ.get('BLOGICUM_ENV', 'dev')
+
+if ENVIRONMENT == 'dev':
+    from .dev import *  # noqa: F401, F403
+elif ENVIRONMENT == 'prod':
+    from .prod import *  # noqa: F401, F403
+else:
+    raise ImproperlyConfigured(
+        f'Неизвестный профиль настроек BLOGICUM_ENV={ENVIRONMENT!r}.'
+    )
@@ -0,0 +1,183 @@
+import os
+from pathlib import Path
+
+from django.core.exceptions import ImproperlyConfigured
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+_MISSING = object()
+
+
+def env(name, default=_MISSING):
+    """Переменная окружения; без default она обязательна."""
+    value = os.environ.get(name, default)
+    if value is _MISSING:
+        raise ImproperlyConfigured(f'Задайте переменную окружения {name}.')
+    return value
+
+
+def env_list(name, default=''):
+    return [item.strip() for item in env(name, default).split(',')
+            if item.strip()]
+
+
+DEBUG = False
+
+ALLOWED_HOSTS = env_list('DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1')
+
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'blog.apps.BlogConfig',
+    'pages.apps.PagesConfig',
+    'django_bootstrap5'
+]
+
+MIDDLEWARE = [
+    'blogicum.middleware.RequestProfilingMiddleware',
+    'blogicum.middleware.ReplicaRoutingMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'blogicum.urls'
+TEMPLATES_DIR = BASE_DIR / 'templates'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'OPTIONS': {
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+# Компилировать шаблоны из DIRS при старте, см. blog.warmup.
+TEMPLATE_WARMUP = True
+
+WSGI_APPLICATION = 'blogicum.wsgi.application'
+
+DATABASE_ROUTERS = ['blogicum.routers.ReplicaRouter']
+
+DATABASE_REPLICAS = []
+
+REPLICA_VIEWS = [
+    'blog:index',
+    'blog:category_posts',
+    'blog:profile',
+    'blog:post_detail',
+]
+
+REPLICA_STICKY_SECONDS = 5
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+LANGUAGE_CODE = 'ru-RU'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_TZ = True
+
+STATICFILES_DIRS = [
+    BASE_DIR / 'static',
+]
+
+STATIC_URL = 'static/'
+
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'blogicum.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+
+LOGIN_URL = 'login'
+
+LOGIN_REDIRECT_URL = 'login'
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+MEDIA_URL = '/media/'
+FILE_UPLOAD_HANDLERS = [
+    'blog.uploads.LimitedTemporaryFileUploadHandler',
+]
+MEDIA_ROOT = BASE_DIR / 'media'
+SERVE_MEDIA = False
+CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
+
+BLOG_KEYSET_PAGINATION = False
+
+PROFILING_SAMPLE_RATE = 0
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'blogicum.profiling': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'blogicum.templates': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
@@ -0,0 +1,47 @@
+from .base import *  # noqa: F401, F403
+from .base import BASE_DIR, env
+
+SECRET_KEY = env(
+    'DJANGO_SECRET_KEY',
+    'django-insecure-n(%zdtwp^lff@36a#q#o#e_1o41*q@6v&z!ccjq6b((8$ugsx5',
+)
+
+DEBUG = True
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # WAL пускает читателей параллельно с писателем, а
+            # BEGIN IMMEDIATE берёт блокировку записи сразу и ждёт её
+            # до timeout секунд вместо ошибки «database is locked».
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 10,
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                'PRAGMA mmap_size=268435456;'
+                'PRAGMA cache_size=-65536;'
+                'PRAGMA journal_size_limit=67108864;'
+            ),
+        },
+    }
+}
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+SERVE_MEDIA = True
+
+# Для runserver и manage.py прогрев лишний: при изменении шаблонов
+# кэш загрузчика всё равно сбрасывается автоперезагрузкой.
+TEMPLATE_WARMUP = False
@@ -0,0 +1,47 @@
+from .base import *  # noqa: F401, F403
+from .base import env, env_list
+
+SECRET_KEY = env('DJANGO_SECRET_KEY')
+
+DEBUG = False
+
+ALLOWED_HOSTS = env_list('DJANGO_ALLOWED_HOSTS')
+
+SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
+
+
+def postgres(host):
+    return {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': env('POSTGRES_DB', 'blogicum'),
+        'USER': env('POSTGRES_USER', 'blogicum'),
+        'PASSWORD': env('POSTGRES_PASSWORD'),
+        'HOST': host,
+        'PORT': env('POSTGRES_PORT', '5432'),
+        # Подключения берутся из пула psycopg, который несовместим
+        # с постоянными подключениями Django.
+        'CONN_MAX_AGE': 0,
+        'OPTIONS': {
+            'pool': {
+                'min_size': int(env('POSTGRES_POOL_MIN_SIZE', '2')),
+                'max_size': int(env('POSTGRES_POOL_MAX_SIZE', '10')),
+                'timeout': int(env('POSTGRES_POOL_TIMEOUT', '10')),
+            },
+        },
+    }
+
+
+DATABASES = {
+    'default': postgres(env('POSTGRES_HOST', 'localhost')),
+}
+DATABASE_REPLICAS = []
+for number, host in enumerate(env_list('POSTGRES_REPLICA_HOSTS')):
+    DATABASE_REPLICAS.append(f'replica_{number}')
+    DATABASES[f'replica_{number}'] = postgres(host)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': env('REDIS_URL', 'redis://127.0.0.1:6379/0'),
+    },
+}
@@ -0,0 +1,44 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest-хранилище статики с заранее сжатыми копиями.
+
+    Рядом с каждым хешированным текстовым файлом collectstatic кладёт
+    ``.gz`` и, если установлен пакет brotli, ``.br``, чтобы веб-сервер
+    отдавал их как есть (gzip_static / brotli_static).
+    """
+
+    compress_extensions = (
+        '.css', '.js', '.map', '.svg', '.json', '.txt', '.html', '.ico',
+    )
+    compress_min_size = 256
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in set(self.hashed_files.values()):
+            if name.endswith(self.compress_extensions):
+                self.compress(name)
+
+    def compress(self, name):
+        with self.open(name) as original:
+            data = original.read()
+        if len(data) < self.compress_min_size:
+            return
+        compressors = [('.gz', lambda data: gzip.compress(data, 9, mtime=0))]
+        if brotli is not None:
+            compressors.append(('.br', brotli.compress))
+        for suffix, compress in compressors:
+            compressed = compress(data)
+            if len(compressed) < len(data):
+                with open(self.path(name + suffix), 'wb') as target:
+                    target.write(compressed)
@@ -1,11 +1,12 @@
+import re
+
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
 from django.contrib.auth.forms import UserCreationForm
-from django.urls import include, path, reverse_lazy
+from django.urls import include, path, re_path, reverse_lazy
 from django.views.generic.edit import CreateView
 
-from blogicum.views import logout_view
+from blogicum.views import logout_view, serve_media
 
 
 urlpatterns = [
@@ -23,7 +24,16 @@ urlpatterns = [
         name='registration',
     ),
     path('auth/logout/', logout_view, name='logout')
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+]
+
+if settings.SERVE_MEDIA:
+    urlpatterns += [
+        re_path(
+            r'^%s(?P<path>.*)$' % re.escape(settings.MEDIA_URL.lstrip('/')),
+            serve_media,
+            name='media',
+        ),
+    ]
 
 
 handler404 = 'pages.views.page_not_found'
@@ -1,8 +1,34 @@
+import re
+
+from django.conf import settings
 from django.contrib.auth.views import LogoutView
-from django.http import Http404
+from django.http import Http404, HttpResponseNotModified
+from django.utils.http import parse_etags
+from django.views.static import serve
+
+CONTENT_ADDRESSED_NAME = re.compile(r'(?:^|/)([0-9a-f]{64})\.\w+$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
 
 
 def logout_view(request):
     if request.method == 'POST':
         raise Http404()
     return LogoutView.as_view()(request)
+
+
+def serve_media(request, path):
+    """Отдаёт медиафайл с условным GET и вечным кэшем для хешированных имён.
+
+    Нужен, когда перед Django нет веб-сервера; файл передаётся через
+    FileResponse, то есть sendfile, если его поддерживает WSGI-сервер.
+    """
+    match = CONTENT_ADDRESSED_NAME.search(path)
+    etag = f'"{match.group(1)}"' if match else None
+    if etag and etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    else:
+        response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    if etag:
+        response['ETag'] = etag
+        response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
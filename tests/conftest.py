@@ -19,6 +19,9 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.backends.base.base import BaseDatabaseWrapper
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
@@ -26,6 +29,7 @@ from django.test import override_settings
 from django.test.client import Client
 from mixer.backend.django import mixer as _mixer
 
+REPLICA_DB_ALIAS = "replica"
 N_PER_FIXTURE = 3
 N_PER_PAGE = 10
 COMMENT_TEXT_DISPLAY_LEN_FOR_TESTS = 50
@@ -41,6 +45,62 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _only_testcase_atomics(connection):
+    return all(
+        getattr(block, "_from_testcase", False)
+        for block in connection.atomic_blocks
+    )
+
+
+@pytest.fixture(autouse=True)
+def run_on_commit_callbacks(monkeypatch):
+    """Выполняет колбэки on_commit так, как после настоящего COMMIT.
+
+    Транзакция теста в TestCase не фиксируется, поэтому колбэки
+    выполняются, когда закрывается последний атомарный блок кода,
+    а вне блоков — сразу.
+    """
+    original_on_commit = BaseDatabaseWrapper.on_commit
+    original_exit = transaction.Atomic.__exit__
+
+    def on_commit(connection, func, robust=False):
+        if connection.in_atomic_block and _only_testcase_atomics(connection):
+            return func()
+        return original_on_commit(connection, func, robust)
+
+    def atomic_exit(atomic, exc_type, exc_value, traceback):
+        result = original_exit(atomic, exc_type, exc_value, traceback)
+        connection = transaction.get_connection(atomic.using)
+        if (exc_type is None and connection.in_atomic_block
+                and _only_testcase_atomics(connection)):
+            callbacks = connection.run_on_commit
+            connection.run_on_commit = []
+            for _, func, _ in callbacks:
+                func()
+        return result
+
+    monkeypatch.setattr(BaseDatabaseWrapper, "on_commit", on_commit)
+    monkeypatch.setattr(transaction.Atomic, "__exit__", atomic_exit)
+
+
+@pytest.fixture(scope="session")
+def django_db_modify_db_settings(django_db_modify_db_settings_parallel_suffix):
+    # Реплика — зеркало основной тестовой базы; тесты маршрутизации
+    # переключают её на отдельный файл SQLite.
+    primary = connections.settings[DEFAULT_DB_ALIAS]
+    connections.settings[REPLICA_DB_ALIAS] = {
+        **primary,
+        "TEST": {**primary["TEST"], "MIRROR": DEFAULT_DB_ALIAS},
+    }
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -0,0 +1,124 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+from blog.paginator import EstimatedCountPaginator
+
+
+@pytest.fixture
+def admin_client_with_posts(admin_client, mixer, published_category):
+    def _with_posts(count):
+        mixer.cycle(count).blend(
+            "blog.Post", category=published_category,
+            location=mixer.blend("blog.Location"),
+        )
+        return admin_client
+    return _with_posts
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url", ["/admin/blog/post/", "/admin/blog/comments/"])
+def test_changelist_queries_do_not_grow_with_rows(
+        admin_client_with_posts, mixer, django_assert_max_num_queries, url
+):
+    client = admin_client_with_posts(3)
+    mixer.cycle(3).blend("blog.Comments", post=Post.objects.first())
+    client.get(url)
+    with django_assert_max_num_queries(10) as queries:
+        client.get(url)
+    baseline = len(queries)
+
+    admin_client_with_posts(20)
+    mixer.cycle(20).blend("blog.Comments", post=Post.objects.first())
+    with django_assert_max_num_queries(baseline):
+        response = client.get(url)
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_author_filter_does_not_list_users(admin_client_with_posts, mixer):
+    client = admin_client_with_posts(2)
+    mixer.cycle(30).blend("auth.User")
+    post = Post.objects.first()
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(
+            "/admin/blog/post/", {"author": post.author.username}
+        )
+    assert list(response.context["cl"].result_list) == [post], (
+        "Убедитесь, что фильтр по автору отбирает публикации"
+        " по имени пользователя."
+    )
+    user_lists = [
+        query["sql"] for query in queries
+        if 'FROM "auth_user"' in query["sql"] and "WHERE" not in query["sql"]
+    ]
+    assert not user_lists, (
+        "Убедитесь, что фильтр по автору не загружает всех"
+        " пользователей:\n" + "\n".join(user_lists)
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url", ["/admin/blog/post/add/", "/admin/blog/comments/add/"]
+)
+def test_change_form_uses_autocomplete(admin_client, mixer, url):
+    mixer.cycle(30).blend("auth.User")
+    content = admin_client.get(url).content.decode()
+    assert "admin-autocomplete" in content, (
+        "Убедитесь, что внешние ключи в форме админки выбираются"
+        " через автодополнение."
+    )
+    assert content.count("<option") < 10
+
+
+@pytest.mark.django_db
+def test_estimated_count_for_unfiltered_changelist(
+        mixer, published_category, monkeypatch
+):
+    monkeypatch.setattr("blog.paginator.ESTIMATED_COUNT_THRESHOLD", 1)
+    mixer.cycle(5).blend("blog.Post", category=published_category)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    mixer.cycle(3).blend("blog.Post", category=published_category)
+
+    assert EstimatedCountPaginator(Post.objects.all(), 10).count == 5, (
+        "Убедитесь, что число строк без фильтров берётся из статистики."
+    )
+    filtered = Post.objects.filter(category=published_category)
+    assert EstimatedCountPaginator(filtered, 10).count == 8, (
+        "Убедитесь, что отфильтрованные выборки считаются точно."
+    )
+
+
+@pytest.mark.django_db
+def test_estimated_count_ignores_partial_indexes(
+        mixer, published_category, monkeypatch
+):
+    monkeypatch.setattr("blog.paginator.ESTIMATED_COUNT_THRESHOLD", 1)
+    mixer.cycle(2).blend(
+        "blog.Post", category=published_category, is_published=True
+    )
+    mixer.cycle(4).blend(
+        "blog.Post", category=published_category, is_published=False
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+        # Строки частичных индексов — первыми, как может вернуть SQLite.
+        cursor.execute(
+            "SELECT tbl, idx, stat FROM sqlite_stat1 WHERE tbl = %s",
+            [Post._meta.db_table],
+        )
+        rows = sorted(cursor.fetchall(), key=lambda row: int(
+            row[2].split()[0]))
+        cursor.execute(
+            "DELETE FROM sqlite_stat1 WHERE tbl = %s", [Post._meta.db_table]
+        )
+        cursor.executemany(
+            "INSERT INTO sqlite_stat1 VALUES (%s, %s, %s)", rows
+        )
+    assert EstimatedCountPaginator(Post.objects.all(), 10).count == 6, (
+        "Убедитесь, что оценка берётся по полной, а не по частичной"
+        " статистике индекса."
+    )
@@ -0,0 +1,159 @@
+"""Поиск в списках админки идёт по индексам, а не сканом таблицы.
+
+Размеры данных и бюджеты лежат в `tests/budgets.json` (`admin_search`).
+С `BLOG_BENCHMARK=1` засевается миллион публикаций и проверяется p95
+времени поиска, подсчёта и выборки страницы списка, а также p95
+ответа всей страницы списка.
+"""
+import statistics
+import time
+from io import StringIO
+
+import pytest
+from django.apps import apps
+from django.contrib.admin import site
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import Mixer
+
+from blog.models import Category, Comments, Location, Post
+from test_budgets import BENCHMARK, BUDGETS, blend_in_batches
+
+ADMIN_SEARCH = BUDGETS["admin_search"]
+
+
+@pytest.fixture(scope="module")
+def admin_dataset(django_db_setup, django_db_blocker):
+    sizes = ADMIN_SEARCH["benchmark_dataset" if BENCHMARK else "dataset"]
+    with django_db_blocker.unblock(), transaction.atomic():
+        mixer = Mixer()
+        User = get_user_model()
+        user_ids = [
+            user.pk for user in mixer.cycle(sizes["users"]).blend(User)
+        ]
+        category_ids = [
+            category.pk for category in
+            mixer.cycle(sizes["categories"]).blend(Category)
+        ]
+        location_ids = [
+            location.pk for location in
+            mixer.cycle(sizes["locations"]).blend(Location)
+        ]
+        blend_in_batches(
+            Post, sizes["posts"],
+            author=user_ids, category=category_ids, location=location_ids,
+        )
+        blend_in_batches(
+            Comments, sizes["comments"],
+            post=list(Post.objects.values_list("pk", flat=True)[:1000]),
+            author=user_ids,
+        )
+        call_command("rebuild_search_index", stdout=StringIO())
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        admin = User.objects.create_superuser(
+            "moderator42", "moderator@blogicum.ru", "pass")
+        post = mixer.blend(
+            Post, author=admin, category_id=category_ids[0],
+            title="Маяк на острове", text="Старый маяк светит кораблям.",
+        )
+        yield {"admin": admin, "post": post}
+        transaction.set_rollback(True)
+
+
+def search_cases(dataset):
+    post = dataset["post"]
+    return {
+        "post-username": ("post", post.author.username, post),
+        "post-category": ("post", post.category.slug, post),
+        "post-fulltext": ("post", "маяки", post),
+        "comments-username": ("comments", post.author.username, None),
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "case", ["post-username", "post-category", "post-fulltext",
+             "comments-username"],
+)
+def test_admin_search_uses_indexes(admin_dataset, case):
+    model, term, expected = search_cases(admin_dataset)[case]
+    client = Client()
+    client.force_login(admin_dataset["admin"])
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f"/admin/blog/{model}/", {"q": term})
+    assert response.status_code == 200
+    scans = [query["sql"] for query in queries if " LIKE " in query["sql"]]
+    assert not scans, (
+        f"Убедитесь, что поиск `{case}` в админке не строит"
+        " `LIKE`-сравнений:\n" + "\n".join(scans)
+    )
+    if expected is not None:
+        found = response.context["cl"].queryset
+        assert found.filter(pk=expected.pk).exists(), (
+            f"Убедитесь, что поиск `{case}` находит публикацию."
+        )
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(not BENCHMARK, reason="Нужен BLOG_BENCHMARK=1.")
+@pytest.mark.parametrize(
+    "case", ["post-username", "post-category", "post-fulltext",
+             "comments-username"],
+)
+def test_admin_search_latency(admin_dataset, case):
+    """Время поиска, подсчёта и выборки первой страницы списка."""
+    model, term, _ = search_cases(admin_dataset)[case]
+    model_admin = site._registry[apps.get_model("blog", model)]
+    request = RequestFactory().get(f"/admin/blog/{model}/", {"q": term})
+    request.user = admin_dataset["admin"]
+    ordering = model_admin.get_ordering(request) or model_admin.opts.ordering
+
+    timings = []
+    for _ in range(BUDGETS["samples"]):
+        started = time.perf_counter()
+        queryset, _ = model_admin.get_search_results(
+            request, model_admin.get_queryset(request), term)
+        queryset = queryset.order_by(*ordering, "-pk")
+        queryset.count()
+        list(queryset[:model_admin.list_per_page])
+        timings.append((time.perf_counter() - started) * 1000)
+    p95 = statistics.quantiles(timings, n=20)[-1]
+    assert p95 <= ADMIN_SEARCH["p95_ms"], (
+        f"p95 поиска `{case}` в админке — {p95:.1f} мс"
+        f" при бюджете {ADMIN_SEARCH['p95_ms']} мс."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(not BENCHMARK, reason="Нужен BLOG_BENCHMARK=1.")
+@pytest.mark.parametrize(
+    "model, params",
+    [
+        ("post", {}),
+        ("post", {"author": "moderator42"}),
+        ("post", {"q": "маяки"}),
+        ("comments", {}),
+    ],
+)
+def test_admin_changelist_latency(admin_dataset, model, params):
+    """Время ответа всей страницы списка с фильтрами и связями."""
+    client = Client()
+    client.force_login(admin_dataset["admin"])
+    url = f"/admin/blog/{model}/"
+    client.get(url, params)
+
+    timings = []
+    for _ in range(BUDGETS["samples"]):
+        started = time.perf_counter()
+        response = client.get(url, params)
+        timings.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200
+    p95 = statistics.quantiles(timings, n=20)[-1]
+    assert p95 <= ADMIN_SEARCH["changelist_p95_ms"], (
+        f"p95 списка `{url}` с {params} — {p95:.1f} мс"
+        f" при бюджете {ADMIN_SEARCH['changelist_p95_ms']} мс."
+    )
@@ -0,0 +1,70 @@
+from http import HTTPStatus
+from inspect import iscoroutinefunction
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, override_settings
+from django.urls import resolve
+
+
+def feed_urls(post):
+    return [
+        "/",
+        f"/posts/{post.id}/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    ]
+
+
+@pytest.mark.django_db
+def test_read_views_are_async(post_with_published_location):
+    for url in feed_urls(post_with_published_location):
+        assert iscoroutinefunction(resolve(url).func), (
+            f"Убедитесь, что представление страницы `{url}` асинхронное."
+        )
+
+
+@pytest.mark.django_db
+def test_read_views_answer_async_client(post_with_published_location):
+    client = AsyncClient()
+    for url in feed_urls(post_with_published_location):
+        response = async_to_sync(client.get)(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f"Убедитесь, что страница `{url}` открывается через ASGI."
+        )
+        assert post_with_published_location.title in response.content.decode()
+
+    url = f"/posts/{post_with_published_location.id}/"
+    etag = async_to_sync(client.get)(url)["ETag"]
+    response = async_to_sync(client.get)(url, headers={"If-None-Match": etag})
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_async_view_hides_unpublished_post(
+        user, another_user, mixer, published_category, published_location
+):
+    post = mixer.blend(
+        "blog.Post", author=user, is_published=False,
+        category=published_category, location=published_location,
+    )
+    url = f"/posts/{post.id}/"
+    client = AsyncClient()
+    assert async_to_sync(client.get)(url).status_code == HTTPStatus.NOT_FOUND
+
+    client.force_login(user)
+    assert async_to_sync(client.get)(url).status_code == HTTPStatus.OK, (
+        "Убедитесь, что автор видит свою неопубликованную запись."
+    )
+
+
+@pytest.mark.django_db
+@override_settings(PROFILING_SAMPLE_RATE=1)
+def test_profiling_counts_async_queries(post_with_published_location):
+    response = async_to_sync(AsyncClient().get)(
+        f"/posts/{post_with_published_location.id}/"
+    )
+    assert 'desc="0 queries"' not in response["Server-Timing"], (
+        "Убедитесь, что профилирование учитывает запросы асинхронных"
+        " представлений."
+    )
@@ -0,0 +1,162 @@
+"""Бюджеты числа SQL-запросов и задержки для маршрутов `blog/urls.py`.
+
+Бюджеты и размеры наборов данных лежат в `tests/budgets.json`.
+По умолчанию данные небольшие и проверяется только число запросов;
+с `BLOG_BENCHMARK=1` засевается большой набор (`benchmark_dataset`)
+и дополнительно проверяется p95 задержки каждого маршрута.
+"""
+import copy
+import json
+import os
+import random
+import statistics
+import time
+from io import StringIO
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.const import COMMENTS_PER_PAGE
+from blog.models import Category, Comments, Location, Post
+
+BUDGETS = json.loads(
+    (Path(__file__).parent / "budgets.json").read_text(encoding="utf-8")
+)
+BENCHMARK = bool(os.environ.get("BLOG_BENCHMARK"))
+BATCH_SIZE = 5000
+TEMPLATES_PER_MODEL = 200
+
+
+def blend_in_batches(model, total, **related_ids):
+    """Засевает `total` строк, размножая шаблоны, созданные mixer.
+
+    Связи заполняются случайными id из `related_ids`; сигналы модели
+    при `bulk_create` не срабатывают, поэтому счётчики и поисковый
+    индекс пересчитываются отдельно.
+    """
+    templates = Mixer(commit=False).cycle(
+        min(total, TEMPLATES_PER_MODEL)
+    ).blend(model, **{name: None for name in related_ids})
+    rows = []
+    for index in range(total):
+        row = copy.copy(templates[index % len(templates)])
+        for name, ids in related_ids.items():
+            setattr(row, f"{name}_id", random.choice(ids))
+        rows.append(row)
+        if len(rows) == BATCH_SIZE:
+            model.objects.bulk_create(rows)
+            rows = []
+    model.objects.bulk_create(rows)
+
+
+@pytest.fixture(scope="module")
+def dataset(django_db_setup, django_db_blocker):
+    sizes = BUDGETS["benchmark_dataset" if BENCHMARK else "dataset"]
+    with django_db_blocker.unblock(), transaction.atomic():
+        mixer = Mixer()
+        User = get_user_model()
+        users = mixer.cycle(sizes["users"]).blend(User)
+        user_ids = [user.pk for user in users]
+        category_ids = [
+            category.pk for category in mixer.cycle(
+                sizes["categories"]).blend(Category, is_published=True)
+        ]
+        location_ids = [
+            location.pk for location in mixer.cycle(
+                sizes["locations"]).blend(Location, is_published=True)
+        ]
+        blend_in_batches(
+            Post, sizes["posts"],
+            author=user_ids, category=category_ids, location=location_ids,
+        )
+        post_ids = list(Post.objects.values_list("pk", flat=True))
+        blend_in_batches(
+            Comments, sizes["comments"], post=post_ids, author=user_ids,
+        )
+        post = mixer.blend(
+            Post, author=users[0], category_id=category_ids[0],
+            location_id=location_ids[0], is_published=True,
+            pub_date=timezone.now() - timedelta(days=1),
+        )
+        blend_in_batches(
+            Comments, COMMENTS_PER_PAGE * 2, post=[post.pk], author=user_ids,
+        )
+        comment = mixer.blend(Comments, post=post, author=users[0])
+        call_command("recount_comments", stdout=StringIO())
+        call_command("rebuild_search_index", stdout=StringIO())
+        yield {"author": users[0], "post": post, "comment": comment}
+        transaction.set_rollback(True)
+
+
+def route_requests(dataset):
+    post, comment = dataset["post"], dataset["comment"]
+    return {
+        "blog:index": ("get", "/"),
+        "blog:category_posts": (
+            "get", f"/category/{post.category.slug}/"),
+        "blog:profile": ("get", f"/profile/{post.author.username}/"),
+        "blog:search": ("get", f"/search/?q={post.title.split()[0]}"),
+        "blog:post_detail": ("get", f"/posts/{post.pk}/"),
+        "blog:post_comments": ("get", f"/posts/{post.pk}/comments/"),
+        "blog:create_post": ("get", "/posts/create/"),
+        "blog:edit_post": ("get", f"/posts/{post.pk}/edit/"),
+        "blog:delete_post": ("get", f"/posts/{post.pk}/delete/"),
+        "blog:add_comment": ("post", f"/posts/{post.pk}/add_comment/"),
+        "blog:edit_comment": (
+            "get", f"/posts/{post.pk}/{comment.pk}/edit_comment/"),
+        "blog:delete_comment": (
+            "get", f"/posts/{post.pk}/{comment.pk}/delete_comment/"),
+        "blog:edit_profile": (
+            "get", f"/profile/{post.author.username}/edit_profile/"),
+    }
+
+
+def test_every_blog_route_has_a_budget():
+    from blog.urls import app_name, urlpatterns
+    routes = {f"{app_name}:{pattern.name}" for pattern in urlpatterns}
+    assert routes == set(BUDGETS["views"]), (
+        "Убедитесь, что для каждого маршрута из `blog/urls.py` задан бюджет"
+        " в `tests/budgets.json`."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("view_name", sorted(BUDGETS["views"]))
+def test_view_stays_within_budget(dataset, view_name):
+    budget = BUDGETS["views"][view_name]
+    method, url = route_requests(dataset)[view_name]
+    client = Client()
+    client.force_login(dataset["author"])
+    request = getattr(client, method)
+    data = {"text": "Комментарий"} if method == "post" else None
+
+    timings = []
+    for _ in range(BUDGETS["samples"]):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = request(url, data)
+            timings.append((time.perf_counter() - started) * 1000)
+        assert response.status_code in (200, 302), (
+            f"Маршрут `{view_name}` вернул код {response.status_code}."
+        )
+        assert len(queries) <= budget["queries"], (
+            f"Маршрут `{view_name}` выполнил {len(queries)} SQL-запросов"
+            f" при бюджете {budget['queries']}:\n"
+            + "\n".join(query["sql"] for query in queries)
+        )
+    if BENCHMARK:
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        assert p95 <= budget["p95_ms"], (
+            f"p95 задержки маршрута `{view_name}` — {p95:.1f} мс"
+            f" при бюджете {budget['p95_ms']} мс."
+        )
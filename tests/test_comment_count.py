@@ -0,0 +1,38 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comments, Post
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_comment_writes(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.post(f"/posts/{post.id}/add_comment/", {"text": "Первый"})
+    user_client.post(f"/posts/{post.id}/add_comment/", {"text": "Второй"})
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что добавление комментария увеличивает"
+        " `Post.comment_count`."
+    )
+
+    comment = Comments.objects.filter(post=post).first()
+    user_client.post(f"/posts/{post.id}/{comment.id}/delete_comment/")
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что удаление комментария уменьшает"
+        " `Post.comment_count`."
+    )
+
+
+@pytest.mark.django_db
+def test_recount_comments_command(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comments", post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=0)
+    call_command("recount_comments", stdout=StringIO())
+    post.refresh_from_db()
+    assert post.comment_count == 3
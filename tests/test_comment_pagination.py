@@ -0,0 +1,51 @@
+import re
+
+import pytest
+
+from blog.const import COMMENTS_PER_PAGE
+
+
+def comment_ids(content):
+    return [int(pk) for pk in re.findall(r'name="comment_(\d+)"', content)]
+
+
+@pytest.mark.django_db
+def test_post_detail_comments_are_paginated(
+        client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(COMMENTS_PER_PAGE + 5).blend(
+        "blog.Comments", post=post
+    )
+    expected = [comment.id for comment in comments]
+
+    response = client.get(f"/posts/{post.id}/")
+    assert comment_ids(response.content.decode()) == (
+        expected[:COMMENTS_PER_PAGE]
+    ), (
+        "Убедитесь, что на странице публикации выводится только первая"
+        " порция комментариев."
+    )
+    next_cursor = response.context["comments"].next_cursor()
+    assert f"comments/?after={next_cursor}" in response.content.decode()
+
+    response = client.get(
+        f"/posts/{post.id}/comments/", {"after": next_cursor}
+    )
+    content = response.content.decode()
+    assert comment_ids(content) == expected[COMMENTS_PER_PAGE:], (
+        "Убедитесь, что адрес `posts/<post_id>/comments/` возвращает"
+        " следующую порцию комментариев."
+    )
+    assert "<form" not in content and "<html" not in content
+
+
+@pytest.mark.django_db
+def test_comment_fragment_of_hidden_post_is_not_found(
+        client, mixer, user, published_category
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False,
+    )
+    assert client.get(f"/posts/{post.id}/comments/").status_code == 404
@@ -0,0 +1,107 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+from django.utils.http import http_date
+
+from blog.models import Post
+
+
+def revalidate(client, url):
+    etag = client.get(url)["ETag"]
+    return etag, client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+
+@pytest.mark.django_db
+def test_post_detail_answers_not_modified(
+        client, user_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    etag, response = revalidate(client, url)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что неизменившаяся страница публикации отвечает 304."
+    )
+
+    user_client.post(f"{url}add_comment/", {"text": "Новый комментарий"})
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что новый комментарий меняет ETag страницы публикации."
+    )
+
+
+@pytest.mark.django_db
+def test_etag_depends_on_user(
+        client, user_client, post_with_published_location
+):
+    url = f"/category/{post_with_published_location.category.slug}/"
+    etag, response = revalidate(client, url)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert user_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == (
+        HTTPStatus.OK
+    ), "Убедитесь, что ETag различается для разных пользователей."
+
+
+@pytest.mark.django_db
+def test_profile_etag_changes_with_author_posts(
+        client, mixer, user, published_category, post_with_published_location
+):
+    url = f"/profile/{user.username}/"
+    etag, response = revalidate(client, url)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    mixer.blend("blog.Post", author=user, category=published_category)
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == (
+        HTTPStatus.OK
+    ), "Убедитесь, что новая публикация автора меняет ETag его профиля."
+
+
+@pytest.mark.django_db
+def test_hidden_post_is_not_found_for_others(
+        client, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    post.is_published = False
+    post.save()
+
+    response = client.get(url, HTTP_IF_MODIFIED_SINCE=http_date())
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что снятая с публикации запись отвечает 404,"
+        " а не 304, пользователям, которые её не видят."
+    )
+    response = user_client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert "ETag" in response and "Last-Modified" in response, (
+        "Убедитесь, что автор по-прежнему получает валидаторы своей записи."
+    )
+
+
+
+@pytest.mark.django_db
+def test_commenter_rename_changes_validators(
+        client, mixer, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.blend("blog.Comments", post=post, author=another_user)
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(days=2),
+        updated_at=timezone.now() - timedelta(days=1),
+    )
+    url = f"/posts/{post.id}/"
+    response = client.get(url)
+    etag, last_modified = response["ETag"], response["Last-Modified"]
+
+    another_user.username = "renamed_commenter"
+    another_user.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что смена имени комментатора меняет ETag страницы"
+        " публикации."
+    )
+    assert "renamed_commenter" in response.content.decode()
+    assert client.get(
+        url, HTTP_IF_MODIFIED_SINCE=last_modified
+    ).status_code == HTTPStatus.OK, (
+        "Убедитесь, что смена имени комментатора обновляет"
+        " `Post.updated_at`."
+    )
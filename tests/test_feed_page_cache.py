@@ -0,0 +1,117 @@
+import pytest
+
+from blog.models import Post
+
+
+@pytest.mark.django_db
+def test_anonymous_feed_page_is_cached(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    client.get("/")
+    Post.objects.filter(pk=post.pk).update(title="Изменено в обход ORM")
+    assert "Изменено в обход ORM" not in client.get("/").content.decode(), (
+        "Убедитесь, что главная страница для анонимных пользователей"
+        " отдаётся из кэша."
+    )
+
+
+@pytest.mark.django_db
+def test_logged_in_feed_page_is_not_cached(
+        user_client, post_with_published_location
+):
+    user_client.get("/")
+    assert user_client.get("/").context is not None, (
+        "Убедитесь, что страницы для авторизованных пользователей"
+        " не берутся из кэша."
+    )
+
+
+@pytest.mark.django_db
+def test_feed_writes_purge_only_affected_feeds(
+        client, mixer, user, post_with_published_location,
+        post_with_another_category
+):
+    category_url = f"/category/{post_with_published_location.category.slug}/"
+    other_url = f"/category/{post_with_another_category.category.slug}/"
+    client.get(category_url)
+    client.get(other_url)
+
+    new_post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=post_with_another_category.category,
+    )
+    assert new_post.title in client.get(other_url).content.decode(), (
+        "Убедитесь, что новая публикация сбрасывает кэш своей категории."
+    )
+    assert new_post.title in client.get("/").content.decode(), (
+        "Убедитесь, что новая публикация сбрасывает кэш главной страницы."
+    )
+    assert client.get(category_url).context is None, (
+        "Убедитесь, что кэш других категорий не сбрасывается."
+    )
+
+
+@pytest.mark.django_db
+def test_category_unpublishing_purges_feeds(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    client.get("/")
+    post.category.is_published = False
+    post.category.save()
+    assert post.title not in client.get("/").content.decode(), (
+        "Убедитесь, что снятие категории с публикации сбрасывает кэш лент."
+    )
+
+
+
+@pytest.mark.django_db
+def test_user_changes_purge_only_own_profile(
+        client, mixer, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    profile_url = f"/profile/{post.author.username}/"
+    other_profile_url = f"/profile/{another_user.username}/"
+    client.get("/")
+    etag = client.get(profile_url)["ETag"]
+    other_etag = client.get(other_profile_url)["ETag"]
+
+    mixer.blend("auth.User")
+    post.author.set_password("new-password")
+    post.author.save()
+    assert client.get("/").context is None, (
+        "Убедитесь, что регистрация и смена пароля не сбрасывают"
+        " кэш главной страницы."
+    )
+    assert client.get(profile_url)["ETag"] == etag
+
+    post.author.first_name = "Новое имя"
+    post.author.save()
+    assert client.get(profile_url)["ETag"] != etag, (
+        "Убедитесь, что правка профиля сбрасывает кэш его страницы."
+    )
+    assert client.get("/").context is None, (
+        "Убедитесь, что правка профиля не сбрасывает кэш главной страницы."
+    )
+    assert client.get(other_profile_url)["ETag"] == other_etag
+
+
+@pytest.mark.django_db
+def test_category_deletion_purges_feeds(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    profile_url = f"/profile/{post.author.username}/"
+    client.get("/")
+    etag = client.get(profile_url)["ETag"]
+    post.category.delete()
+    assert post.title not in client.get("/").content.decode(), (
+        "Убедитесь, что удаление категории сбрасывает кэш главной"
+        " страницы."
+    )
+    assert client.get(profile_url)["ETag"] != etag, (
+        "Убедитесь, что удаление категории сбрасывает кэш профилей"
+        " авторов её публикаций."
+    )
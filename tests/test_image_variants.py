@@ -0,0 +1,179 @@
+from datetime import timedelta
+from io import BytesIO, StringIO
+
+import pytest
+from bs4 import BeautifulSoup
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.utils import timezone
+from PIL import Image
+
+from blog.const import IMAGE_JOB_TIMEOUT, IMAGE_VARIANTS
+from blog.images import build_image_variants
+from blog.models import ImageJob, Post
+from blog.tasks import (
+    claim_next_job,
+    enqueue_image_variants,
+    run_pending_jobs,
+)
+
+
+@pytest.fixture(autouse=True)
+def media_root(tmp_path, settings):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def make_upload(width, height):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), color=(73, 109, 137)).save(
+        buffer, "PNG"
+    )
+    return SimpleUploadedFile(
+        "big_image.png", buffer.getvalue(), content_type="image/png"
+    )
+
+
+@pytest.mark.django_db
+def test_create_post_builds_image_variants(user_client, published_category):
+    user_client.post("/posts/create/", {
+        "title": "С картинкой",
+        "text": "Текст",
+        "pub_date": "2020-01-01",
+        "category": published_category.id,
+        "is_published": True,
+        "image": make_upload(2000, 1000),
+    })
+    post = Post.objects.get(title="С картинкой")
+    assert post.image_variants == {}, (
+        "Убедитесь, что копии изображения строятся вне запроса."
+    )
+    assert run_pending_jobs() == 1
+    post.refresh_from_db()
+    assert set(post.image_variants) == set(IMAGE_VARIANTS), (
+        "Убедитесь, что при создании публикации сохраняются уменьшенные"
+        " копии изображения."
+    )
+    for name, width in IMAGE_VARIANTS.items():
+        variant = post.image_variants[name]
+        assert (variant["width"], variant["height"]) == (width, width // 2)
+        assert post.image.storage.size(variant["name"]) < post.image.size
+
+    img = BeautifulSoup(
+        user_client.get("/").content.decode(), features="html.parser"
+    ).find("img", srcset=True)
+    assert img["width"] == str(IMAGE_VARIANTS["card"])
+    assert post.image_variants["card"]["name"] in img["src"]
+    assert post.image_variants["full"]["name"] not in img["srcset"], (
+        "Убедитесь, что в ленте не предлагается копия крупнее карточки."
+    )
+
+
+@pytest.mark.django_db
+def test_small_image_is_not_upscaled(user_client, published_category):
+    user_client.post("/posts/create/", {
+        "title": "Маленькая",
+        "text": "Текст",
+        "pub_date": "2020-01-01",
+        "category": published_category.id,
+        "is_published": True,
+        "image": make_upload(400, 300),
+    })
+    run_pending_jobs()
+    variants = Post.objects.get(title="Маленькая").image_variants
+    assert variants["card"]["width"] == 400
+    assert variants["card"] == variants["full"]
+
+
+@pytest.mark.django_db
+def test_image_job_failures_are_recorded(user, published_category, mixer):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image="images/missing.png",
+    )
+    job = ImageJob.objects.create(post=post)
+    out = StringIO()
+    call_command("run_image_jobs", "--once", stdout=out)
+    job.refresh_from_db()
+    assert job.status == ImageJob.Status.FAILED
+    assert job.error and job.finished_at
+
+    call_command("image_jobs", stdout=out)
+    assert f"Публикация {post.id}:" in out.getvalue(), (
+        "Убедитесь, что команда `image_jobs` показывает упавшие задачи."
+    )
+
+
+@pytest.mark.django_db
+def test_stale_job_keeps_newer_upload(
+        user_client, published_category, monkeypatch
+):
+    user_client.post("/posts/create/", {
+        "title": "Замена",
+        "text": "Текст",
+        "pub_date": "2020-01-01",
+        "category": published_category.id,
+        "is_published": True,
+        "image": make_upload(2000, 1000),
+    })
+    stale = Post.objects.get(title="Замена")
+    storage = stale.image.storage
+    saved = []
+    replacing = []
+    original_save = storage.save
+
+    def save_and_replace(name, content, *args, **kwargs):
+        if replacing:
+            return original_save(name, content, *args, **kwargs)
+        if not saved:
+            # Автор загружает новое изображение, пока воркер строит копии.
+            replacing.append(True)
+            post = Post.objects.get(pk=stale.pk)
+            post.image = make_upload(1600, 800)
+            post.save()
+            stale.title = "Старый экземпляр"
+            stale.save(update_fields=["title"])
+            replacing.clear()
+        saved.append(original_save(name, content, *args, **kwargs))
+        return saved[-1]
+
+    monkeypatch.setattr(storage, "save", save_and_replace)
+    build_image_variants(stale)
+    post = Post.objects.get(pk=stale.pk)
+    assert storage.exists(post.image.name), (
+        "Убедитесь, что сохранение устаревшего экземпляра публикации"
+        " не удаляет загруженное позже изображение."
+    )
+    assert post.image_variants == {}, (
+        "Убедитесь, что копии заменённого изображения не записываются"
+        " в публикацию."
+    )
+    assert saved and not any(storage.exists(name) for name in saved), (
+        "Убедитесь, что копии заменённого изображения удаляются."
+    )
+
+
+@pytest.mark.django_db
+def test_image_job_queue_recovers_and_deduplicates(
+        user, published_category, mixer
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        image="images/missing.png",
+    )
+    enqueue_image_variants(post)
+    enqueue_image_variants(post)
+    assert ImageJob.objects.filter(post=post).count() == 1, (
+        "Убедитесь, что для публикации в очереди не больше одной задачи."
+    )
+
+    job = claim_next_job()
+    assert claim_next_job() is None
+    ImageJob.objects.filter(pk=job.pk).update(
+        started_at=timezone.now() - timedelta(seconds=IMAGE_JOB_TIMEOUT + 1)
+    )
+    reclaimed = claim_next_job()
+    assert reclaimed is not None and reclaimed.pk == job.pk, (
+        "Убедитесь, что задача упавшего воркера возвращается в работу."
+    )
+    assert claim_next_job() is None
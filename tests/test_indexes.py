@@ -0,0 +1,48 @@
+import pytest
+from django.db import connection
+
+from blog.models import Comments
+from blog.views import select_posts
+
+
+@pytest.fixture
+def explain():
+    if connection.vendor not in ("sqlite", "postgresql"):
+        pytest.skip("EXPLAIN-проверки написаны для SQLite и PostgreSQL.")
+
+    def _explain(queryset):
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+        return queryset.explain()
+
+    return _explain
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "get_queryset, index_name",
+    [
+        (lambda category, user: select_posts(), "post_pub_date_idx"),
+        (
+            lambda category, user: select_posts(category.posts),
+            "post_published_category_idx",
+        ),
+        (
+            lambda category, user: select_posts(user.posts),
+            "post_author_feed_idx",
+        ),
+        (
+            lambda category, user: Comments.objects.filter(post_id=1),
+            "comment_post_created_idx",
+        ),
+    ],
+)
+def test_feed_queries_use_indexes(
+        explain, get_queryset, index_name, published_category, user
+):
+    plan = explain(get_queryset(published_category, user))
+    assert index_name in plan, (
+        f"Убедитесь, что запрос использует индекс `{index_name}`. "
+        f"План запроса:\n{plan}"
+    )
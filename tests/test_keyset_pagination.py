@@ -0,0 +1,55 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import override_settings
+
+from conftest import N_PER_PAGE
+
+
+@pytest.mark.django_db
+@override_settings(BLOG_KEYSET_PAGINATION=True)
+def test_keyset_pagination_walks_feed(
+        client, many_posts_with_published_locations
+):
+    expected = sorted(
+        many_posts_with_published_locations,
+        key=lambda post: (post.pub_date, post.pk),
+        reverse=True,
+    )
+    response = client.get("/")
+    assert response.status_code == HTTPStatus.OK
+    first_page = response.context["page_obj"]
+    assert [post.pk for post in first_page] == [
+        post.pk for post in expected[:N_PER_PAGE]
+    ], (
+        "Убедитесь, что первая страница ленты при пагинации по курсору"
+        " содержит самые свежие публикации."
+    )
+    assert first_page.has_next() and not first_page.has_previous()
+    assert f"?after={first_page.next_cursor()}" in response.content.decode()
+
+    response = client.get("/", {"after": first_page.next_cursor()})
+    second_page = response.context["page_obj"]
+    assert [post.pk for post in second_page] == [
+        post.pk for post in expected[N_PER_PAGE:2 * N_PER_PAGE]
+    ], (
+        "Убедитесь, что курсор `after` открывает следующую страницу ленты."
+    )
+    assert second_page.has_previous() and not second_page.has_next()
+
+    response = client.get("/", {"before": second_page.previous_cursor()})
+    assert [post.pk for post in response.context["page_obj"]] == [
+        post.pk for post in first_page
+    ], (
+        "Убедитесь, что курсор `before` возвращает на предыдущую страницу."
+    )
+
+
+@pytest.mark.django_db
+@override_settings(BLOG_KEYSET_PAGINATION=True)
+def test_keyset_pagination_ignores_broken_cursor(
+        client, many_posts_with_published_locations
+):
+    response = client.get("/", {"after": "not-a-cursor"})
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.context["page_obj"]) == N_PER_PAGE
@@ -0,0 +1,110 @@
+from http import HTTPStatus
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import transaction
+from PIL import Image
+
+from blog.models import Post
+from blog.storage import image_storage
+
+
+def image_file(color):
+    buffer = BytesIO()
+    Image.new("RGB", (50, 50), color=color).save(buffer, "PNG")
+    return ContentFile(buffer.getvalue(), name="Photo.PNG")
+
+
+@pytest.fixture(autouse=True)
+def media_root(tmp_path, settings):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def make_post(mixer, user, published_category):
+    def _make_post(color):
+        post = mixer.blend(
+            "blog.Post", author=user, category=published_category, image=None
+        )
+        post.image.save("Photo.PNG", image_file(color))
+        return post
+    return _make_post
+
+
+@pytest.mark.django_db
+def test_identical_uploads_share_one_blob(make_post):
+    first, second = make_post((1, 2, 3)), make_post((1, 2, 3))
+    assert first.image.name == second.image.name, (
+        "Убедитесь, что одинаковые изображения сохраняются в один файл."
+    )
+    assert first.image.name.endswith(".png")
+    assert make_post((4, 5, 6)).image.name != first.image.name
+
+    first.delete()
+    assert image_storage.exists(second.image.name), (
+        "Убедитесь, что файл, на который ссылается другой пост,"
+        " не удаляется."
+    )
+    second.delete()
+    assert not image_storage.exists(second.image.name), (
+        "Убедитесь, что файл без ссылок удаляется вместе с постом."
+    )
+
+
+@pytest.mark.django_db
+def test_replaced_image_is_collected(make_post):
+    post = make_post((7, 8, 9))
+    old_name = post.image.name
+    post.image.save("Photo.PNG", image_file((10, 11, 12)))
+    assert not image_storage.exists(old_name)
+    assert Post.objects.get(pk=post.pk).image_variants == {}
+
+
+@pytest.mark.django_db
+def test_collect_media_removes_orphans(make_post):
+    post = make_post((13, 14, 15))
+    orphan = image_storage.save("images/orphan.png", image_file((16, 17, 18)))
+    call_command("collect_media", "--min-age=0", stdout=StringIO())
+    assert not image_storage.exists(orphan)
+    assert image_storage.exists(post.image.name)
+
+
+@pytest.mark.django_db
+def test_reuploading_same_image_keeps_file(user_client, make_post):
+    post = make_post((19, 20, 21))
+    name = post.image.name
+    response = user_client.post(f"/posts/{post.id}/edit/", {
+        "title": post.title,
+        "text": post.text,
+        "pub_date": post.pub_date.strftime("%Y-%m-%d %H:%M"),
+        "category": post.category_id,
+        "is_published": True,
+        "image": SimpleUploadedFile(
+            "Photo.png", image_file((19, 20, 21)).read(),
+            content_type="image/png",
+        ),
+    })
+    assert response.status_code == HTTPStatus.FOUND
+    post.refresh_from_db()
+    assert post.image.name == name
+    assert image_storage.exists(name), (
+        "Убедитесь, что повторная загрузка того же изображения не удаляет"
+        " файл, на который ссылается публикация."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rolled_back_delete_keeps_image(make_post):
+    post = make_post((22, 23, 24))
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            post.delete()
+            raise RuntimeError
+    assert image_storage.exists(post.image.name), (
+        "Убедитесь, что изображение удаляется только после фиксации"
+        " транзакции."
+    )
@@ -0,0 +1,86 @@
+import pytest
+from django.core.cache import cache
+from django.db import transaction
+
+from blog.models import Post
+
+# Страницы анонимов целиком берутся из кэша лент, поэтому кэш
+# карточек проверяется через ленту авторизованного пользователя.
+
+
+@pytest.mark.django_db
+def test_post_card_is_served_from_cache_until_invalidated(
+        user_client, another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    assert post.title in another_user_client.get("/").content.decode()
+
+    Post.objects.filter(pk=post.pk).update(title="Обновлено в обход ORM")
+    assert post.title in another_user_client.get("/").content.decode(), (
+        "Убедитесь, что карточка публикации берётся из кэша фрагментов."
+    )
+
+    user_client.post(f"/posts/{post.id}/add_comment/", {"text": "Текст"})
+    content = another_user_client.get("/").content.decode()
+    assert "Обновлено в обход ORM" in content, (
+        "Убедитесь, что новый комментарий сбрасывает кэш карточки публикации."
+    )
+    assert "Комментарии (1)" in content
+
+
+@pytest.mark.django_db
+def test_post_card_cache_is_invalidated_by_post_save(
+        another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    another_user_client.get("/")
+    post.title = "Новый заголовок"
+    post.save()
+    assert "Новый заголовок" in another_user_client.get("/").content.decode(), (
+        "Убедитесь, что сохранение публикации сбрасывает кэш её карточки."
+    )
+
+
+@pytest.mark.django_db
+def test_post_card_is_invalidated_after_commit(
+        another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    another_user_client.get("/")
+    with transaction.atomic():
+        post.title = "Заголовок до фиксации"
+        post.save()
+        assert "Заголовок до фиксации" not in (
+            another_user_client.get("/").content.decode()
+        ), (
+            "Убедитесь, что кэш карточки сбрасывается только после"
+            " фиксации транзакции."
+        )
+    assert "Заголовок до фиксации" in (
+        another_user_client.get("/").content.decode()
+    )
+
+
+@pytest.mark.django_db
+def test_post_card_cache_entries_expire(
+        another_user_client, post_with_published_location, monkeypatch
+):
+    timeouts = []
+    original_set = cache.set
+    original_set_many = cache.set_many
+
+    def set_(key, value, timeout=None, *args, **kwargs):
+        timeouts.append(timeout)
+        return original_set(key, value, timeout, *args, **kwargs)
+
+    def set_many(data, timeout=None, *args, **kwargs):
+        timeouts.append(timeout)
+        return original_set_many(data, timeout, *args, **kwargs)
+
+    monkeypatch.setattr(cache, "set", set_)
+    monkeypatch.setattr(cache, "set_many", set_many)
+    another_user_client.get("/")
+    assert timeouts and None not in timeouts, (
+        "Убедитесь, что версии и фрагменты карточек хранятся в кэше"
+        " ограниченное время."
+    )
@@ -0,0 +1,33 @@
+import pytest
+
+from conftest import N_PER_FIXTURE
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("n_comments", [1, N_PER_FIXTURE * 10])
+def test_post_detail_query_count_does_not_depend_on_comments(
+        client, mixer, post_with_published_location,
+        django_assert_num_queries, n_comments
+):
+    post = post_with_published_location
+    mixer.cycle(n_comments).blend("blog.Comments", post=post)
+    client.get(f"/posts/{post.id}/")
+    with django_assert_num_queries(2):
+        response = client.get(f"/posts/{post.id}/")
+    assert response.status_code == 200
+    assert response.content.decode().count('name="comment_') == n_comments
+
+
+@pytest.mark.django_db
+def test_post_detail_for_author_of_unpublished_post(
+        user_client, mixer, user, published_category,
+        django_assert_max_num_queries
+):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False,
+    )
+    mixer.cycle(N_PER_FIXTURE).blend("blog.Comments", post=post)
+    with django_assert_max_num_queries(7):
+        response = user_client.get(f"/posts/{post.id}/")
+    assert response.status_code == 200
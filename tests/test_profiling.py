@@ -0,0 +1,30 @@
+import json
+
+import pytest
+from django.test import Client, override_settings
+
+
+@pytest.mark.django_db
+def test_profiling_is_disabled_by_default(post_with_published_location):
+    response = Client().get("/")
+    assert "Server-Timing" not in response
+
+
+@pytest.mark.django_db
+@override_settings(PROFILING_SAMPLE_RATE=1)
+def test_profiling_reports_sql_and_templates(
+        post_with_published_location, caplog
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    Client().get(url)
+    with caplog.at_level("INFO", logger="blogicum.profiling"):
+        response = Client().get(url)
+    server_timing = response["Server-Timing"]
+    assert 'sql;dur=' in server_timing and 'desc="2 queries"' in server_timing
+    assert 'desc="blog/detail.html"' in server_timing
+    assert 'total;dur=' in server_timing
+
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record["view"] == "blog:post_detail"
+    assert record["sql_count"] == 2
+    assert "includes/comments.html" in record["templates_ms"]
@@ -0,0 +1,102 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from blog.models import Post
+from blogicum.routers import PRIMARY_COOKIE
+from conftest import REPLICA_DB_ALIAS as REPLICA
+
+pytestmark = pytest.mark.django_db(
+    transaction=True, databases=[DEFAULT_DB_ALIAS, REPLICA]
+)
+
+
+@pytest.fixture
+def replicate(tmp_path, settings):
+    """Реплика в отдельном файле SQLite, догоняемая до основной базы."""
+    path = tmp_path / "replica.sqlite3"
+    replica = connections[REPLICA]
+    mirror_name = replica.settings_dict["NAME"]
+    replica.close()
+    replica.settings_dict["NAME"] = str(path)
+    settings.DATABASE_REPLICAS = [REPLICA]
+
+    def copy_primary():
+        replica.close()
+        path.unlink(missing_ok=True)
+        with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            cursor.execute("VACUUM INTO %s", [str(path)])
+
+    yield copy_primary
+    replica.close()
+    replica.settings_dict["NAME"] = mirror_name
+
+
+def test_feed_views_read_from_replica(
+        replicate, client, post_with_published_location
+):
+    post = post_with_published_location
+    replicate()
+    client.get(f"/posts/{post.id}/")
+    Post.objects.filter(pk=post.pk).update(title="Заголовок из основной базы")
+
+    response = client.get(f"/posts/{post.id}/")
+    assert response.status_code == HTTPStatus.OK
+    assert post.title in response.content.decode(), (
+        "Убедитесь, что страница публикации читается с реплики."
+    )
+    assert PRIMARY_COOKIE not in response.cookies
+    assert post.title in client.get(
+        f"/profile/{post.author.username}/"
+    ).content.decode()
+
+
+def test_writer_reads_own_comment_from_primary(
+        replicate, client, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    replicate()
+
+    response = user_client.post(
+        f"/posts/{post.id}/add_comment/",
+        {"text": "Комментарий только в основной базе"},
+        follow=True,
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert "Комментарий только в основной базе" in (
+        response.content.decode()
+    ), (
+        "Убедитесь, что после добавления комментария автор читает"
+        " страницу публикации из основной базы."
+    )
+    assert PRIMARY_COOKIE in user_client.cookies
+
+    assert "Комментарий только в основной базе" not in client.get(
+        f"/posts/{post.id}/"
+    ).content.decode(), (
+        "Убедитесь, что остальные читатели по-прежнему читают с реплики."
+    )
+
+
+def test_replica_reads_do_not_fill_shared_caches(
+        replicate, client, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    replicate()
+    # Основная база ушла вперёд, реплика ещё отстаёт.
+    Post.objects.filter(pk=post.pk).update(title="Заголовок после правки")
+
+    assert post.title in user_client.get("/").content.decode()
+    replicate()
+    assert "Заголовок после правки" in user_client.get("/").content.decode(), (
+        "Убедитесь, что фрагмент карточки, собранный по данным реплики,"
+        " не сохраняется в кэш."
+    )
+
+    lag_title = "Заголовок, которого нет на реплике"
+    Post.objects.filter(pk=post.pk).update(title=lag_title)
+    assert lag_title in client.get("/").content.decode(), (
+        "Убедитесь, что страница ленты, которая попадёт в кэш, читается"
+        " из основной базы."
+    )
@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.cache import feed_page_timeout
+from blog.const import FEED_PAGE_CACHE_TIMEOUT
+
+
+@pytest.mark.django_db
+def test_feed_timeout_without_scheduled_posts(post_with_published_location):
+    assert feed_page_timeout() == FEED_PAGE_CACHE_TIMEOUT
+
+
+@pytest.mark.django_db
+def test_feed_timeout_expires_at_next_publication(
+        mixer, user, published_category
+):
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(minutes=10),
+    )
+    assert 595 <= feed_page_timeout() <= 600, (
+        "Убедитесь, что кэш лент истекает к моменту ближайшей"
+        " отложенной публикации."
+    )
+
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(seconds=30),
+    )
+    assert 25 <= feed_page_timeout() <= 30, (
+        "Убедитесь, что новая отложенная публикация сдвигает срок жизни"
+        " кэша лент."
+    )
+
+
+@pytest.mark.django_db
+def test_next_publication_is_recomputed_once_reached(
+        mixer, user, published_category
+):
+    scheduled = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(seconds=1),
+    )
+    assert feed_page_timeout() <= 1
+    scheduled_time = scheduled.pub_date + timedelta(seconds=2)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(timezone, "now", lambda: scheduled_time)
+        assert feed_page_timeout() == FEED_PAGE_CACHE_TIMEOUT
@@ -0,0 +1,87 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from blog.search import fts5_query
+
+
+def search(client, query, **params):
+    response = client.get("/search/", {"q": query, **params})
+    assert response.status_code == HTTPStatus.OK
+    return list(response.context["page_obj"])
+
+
+@pytest.mark.django_db
+def test_search_ranks_title_matches_first(
+        client, mixer, user, published_category
+):
+    in_text = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+        title="Заметка", text="Во дворе мы играли с рыжими кошками.",
+    )
+    in_title = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=2),
+        title="Кошки", text="Про животных.",
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, title="Собаки", text="Про собак.",
+    )
+    assert search(client, "кошка") == [in_title, in_text], (
+        "Убедитесь, что поиск находит словоформы и ставит совпадения"
+        " в заголовке выше совпадений в тексте."
+    )
+
+
+@pytest.mark.django_db
+def test_search_shows_only_published_posts(
+        client, mixer, user, published_category
+):
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False, title="Черновик о море",
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(days=1),
+        title="Отложенный пост о море",
+    )
+    assert search(client, "море") == [], (
+        "Убедитесь, что поиск не показывает неопубликованные"
+        " и отложенные публикации."
+    )
+
+
+@pytest.mark.django_db
+def test_search_index_follows_post_writes(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    post.title = "Маяк"
+    post.save()
+    assert search(client, "маяк") == [post], (
+        "Убедитесь, что изменённая публикация переиндексируется."
+    )
+    post.delete()
+    assert search(client, "маяк") == []
+
+
+@pytest.mark.django_db
+def test_search_paginates(client, mixer, user, published_category):
+    mixer.cycle(12).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, title="Путешествие",
+        pub_date=timezone.now() - timedelta(hours=1),
+    )
+    assert len(search(client, "путешествия")) == 10
+    assert len(search(client, "путешествия", page=2)) == 2
+
+
+def test_fts5_query_escapes_operators():
+    assert fts5_query('NEAR("кошки" OR собаки)') == (
+        '"near"* "кошк"* "or"* "собак"*'
+    )
@@ -0,0 +1,76 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / "blogicum"
+PROD_ENVIRON = {
+    "BLOGICUM_ENV": "prod",
+    "DJANGO_SECRET_KEY": "secret",
+    "DJANGO_ALLOWED_HOSTS": "blog.example.com",
+    "POSTGRES_PASSWORD": "password",
+    "POSTGRES_REPLICA_HOSTS": "replica.example.com",
+    "REDIS_URL": "redis://cache.example.com:6379/1",
+}
+
+
+def load_settings(**environ):
+    """Загружает настройки в отдельном процессе с заданным окружением."""
+    code = (
+        "import json; from django.conf import settings; print(json.dumps({"
+        "'debug': settings.DEBUG,"
+        "'databases': settings.DATABASES,"
+        "'replicas': settings.DATABASE_REPLICAS,"
+        "'caches': settings.CACHES,"
+        "'templates': settings.TEMPLATES,"
+        "}, default=str))"
+    )
+    environ = {
+        key: value for key, value in os.environ.items()
+        if key not in PROD_ENVIRON
+    } | {"DJANGO_SETTINGS_MODULE": "blogicum.settings"} | environ
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_DIR, env=environ, capture_output=True, text=True,
+    )
+    if result.returncode:
+        raise RuntimeError(result.stderr)
+    return json.loads(result.stdout)
+
+
+def test_dev_profile_is_default():
+    settings = load_settings()
+    assert settings["debug"] is True
+    assert settings["databases"]["default"]["ENGINE"] == (
+        "django.db.backends.sqlite3"
+    )
+
+
+def test_prod_profile_from_environment():
+    settings = load_settings(**PROD_ENVIRON)
+    assert settings["debug"] is False, (
+        "Убедитесь, что в production-профиле `DEBUG=False`."
+    )
+    database = settings["databases"]["default"]
+    assert database["ENGINE"] == "django.db.backends.postgresql"
+    assert database["OPTIONS"]["pool"]["max_size"] > 0, (
+        "Убедитесь, что production-профиль использует пул подключений."
+    )
+    assert database["PASSWORD"] == "password"
+    assert settings["replicas"] == ["replica_0"]
+    assert settings["databases"]["replica_0"]["HOST"] == "replica.example.com"
+    assert settings["caches"]["default"]["LOCATION"] == (
+        PROD_ENVIRON["REDIS_URL"]
+    )
+    loaders = settings["templates"][0]["OPTIONS"]["loaders"]
+    assert loaders[0][0] == "django.template.loaders.cached.Loader"
+
+
+def test_prod_profile_requires_secrets():
+    environ = dict(PROD_ENVIRON)
+    del environ["DJANGO_SECRET_KEY"]
+    with pytest.raises(RuntimeError, match="DJANGO_SECRET_KEY"):
+        load_settings(**environ)
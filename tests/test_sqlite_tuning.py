@@ -0,0 +1,44 @@
+import pytest
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+
+
+def pragma(cursor, name):
+    cursor.execute(f"PRAGMA {name}")
+    return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+def test_connection_pragmas():
+    with connection.cursor() as cursor:
+        assert pragma(cursor, "synchronous") == 1, (
+            "Убедитесь, что подключение к SQLite использует"
+            " `synchronous=NORMAL`."
+        )
+        assert pragma(cursor, "busy_timeout") == 10000, (
+            "Убедитесь, что подключение ждёт блокировку записи,"
+            " а не падает с «database is locked»."
+        )
+        assert pragma(cursor, "cache_size") == -65536
+    assert connection.settings_dict["CONN_MAX_AGE"] > 0, (
+        "Убедитесь, что подключения к базе переиспользуются."
+    )
+
+
+@pytest.mark.django_db
+def test_file_database_uses_wal(tmp_path):
+    settings_dict = {
+        **connections[DEFAULT_DB_ALIAS].settings_dict,
+        "NAME": str(tmp_path / "db.sqlite3"),
+    }
+    file_connection = connections[DEFAULT_DB_ALIAS].__class__(settings_dict)
+    try:
+        with file_connection.cursor() as cursor:
+            assert pragma(cursor, "journal_mode") == "wal", (
+                "Убедитесь, что база SQLite в файле работает в режиме WAL."
+            )
+            assert pragma(cursor, "mmap_size") == 268435456
+        assert file_connection.transaction_mode == "IMMEDIATE", (
+            "Убедитесь, что транзакции сразу берут блокировку записи."
+        )
+    finally:
+        file_connection.close()
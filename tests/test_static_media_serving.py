@@ -0,0 +1,48 @@
+from io import StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+
+from blog.storage import image_storage
+
+
+@pytest.mark.django_db
+def test_content_addressed_media_is_immutable(client, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    name = image_storage.save("images/a.png", ContentFile(b"png" * 100))
+
+    response = client.get(f"/media/{name}")
+    assert response.status_code == 200
+    assert "immutable" in response["Cache-Control"], (
+        "Убедитесь, что файлы с хешем содержимого в имени кэшируются"
+        " навсегда."
+    )
+    etag = response["ETag"]
+
+    response = client.get(f"/media/{name}", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304, (
+        "Убедитесь, что медиафайлы поддерживают условный GET."
+    )
+
+
+def test_collectstatic_writes_hashed_and_precompressed_files(
+        settings, tmp_path
+):
+    settings.STATIC_ROOT = tmp_path
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {
+            "BACKEND": (
+                "blogicum.storage.CompressedManifestStaticFilesStorage"
+            ),
+        },
+    }
+    call_command("collectstatic", "--noinput", stdout=StringIO())
+    css_dir = tmp_path / "admin" / "css"
+    hashed = list(css_dir.glob("base.*.css"))
+    assert hashed, "Убедитесь, что collectstatic хеширует имена файлов."
+    assert (css_dir / f"{hashed[0].name}.gz").is_file(), (
+        "Убедитесь, что рядом со статикой лежат сжатые копии."
+    )
+    assert (tmp_path / "staticfiles.json").is_file()
@@ -0,0 +1,37 @@
+import pytest
+from django.template import engines
+
+from blog.warmup import template_names, warm_up_templates
+
+
+def cached_templates():
+    loader = engines["django"].engine.template_loaders[0]
+    return loader.get_template_cache
+
+
+def test_warm_up_compiles_project_templates(settings, caplog):
+    cached_templates().clear()
+    with caplog.at_level("INFO", logger="blogicum.templates"):
+        compiled = warm_up_templates()
+    assert compiled == len(template_names(settings.TEMPLATES_DIR))
+    for name in ("base.html", "includes/post_card.html", "blog/detail.html"):
+        assert name in cached_templates(), (
+            f"Убедитесь, что прогрев компилирует шаблон `{name}`."
+        )
+    assert "Шаблоны скомпилированы" in caplog.records[-1].getMessage(), (
+        "Убедитесь, что прогрев сообщает, сколько он занял."
+    )
+
+
+@pytest.mark.django_db
+def test_first_request_after_warm_up_does_not_parse(
+        client, post_with_published_location
+):
+    cached_templates().clear()
+    warm_up_templates()
+    warmed = set(cached_templates())
+    client.get(f"/posts/{post_with_published_location.id}/")
+    assert set(cached_templates()) == warmed, (
+        "Убедитесь, что после прогрева страница публикации не"
+        " компилирует новых шаблонов."
+    )
@@ -0,0 +1,93 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+from django.utils.http import http_date
+
+from blog.models import Post
+
+
+def age(post, delta=timedelta(days=1)):
+    Post.objects.filter(pk=post.pk).update(
+        updated_at=timezone.now() - delta
+    )
+    post.refresh_from_db()
+    return post.updated_at
+
+
+@pytest.mark.django_db
+def test_bulk_update_sets_updated_at(post_with_published_location):
+    post = post_with_published_location
+    before = age(post)
+    Post.objects.filter(pk=post.pk).update(is_published=False)
+    post.refresh_from_db()
+    assert post.updated_at > before, (
+        "Убедитесь, что `QuerySet.update()` обновляет `updated_at`."
+    )
+
+
+@pytest.mark.django_db
+def test_related_changes_touch_post(mixer, post_with_published_location):
+    post = post_with_published_location
+    before = age(post)
+    comment = mixer.blend("blog.Comments", post=post)
+    post.refresh_from_db()
+    assert post.updated_at > before, (
+        "Убедитесь, что новый комментарий обновляет `Post.updated_at`."
+    )
+
+    before = age(post)
+    comment.text = "Исправленный комментарий"
+    comment.save()
+    post.refresh_from_db()
+    assert post.updated_at > before, (
+        "Убедитесь, что правка комментария обновляет `Post.updated_at`."
+    )
+
+    before = age(post)
+    post.category.title = "Новое название"
+    post.category.save()
+    post.refresh_from_db()
+    assert post.updated_at > before, (
+        "Убедитесь, что правка категории обновляет `Post.updated_at`"
+        " её публикаций."
+    )
+
+
+@pytest.mark.django_db
+def test_unrelated_changes_do_not_touch_post(post_with_published_location):
+    post = post_with_published_location
+    before = age(post)
+    post.category.description = "Новое описание"
+    post.category.save()
+    post.author.first_name = "Новое имя"
+    post.author.set_password("new-password")
+    post.author.save()
+    post.refresh_from_db()
+    assert post.updated_at == before, (
+        "Убедитесь, что `Post.updated_at` не меняется, если изменились"
+        " поля, которых нет на странице публикации."
+    )
+
+    post.author.username = "renamed_author"
+    post.author.save()
+    post.refresh_from_db()
+    assert post.updated_at > before, (
+        "Убедитесь, что смена имени автора обновляет `Post.updated_at`."
+    )
+
+
+@pytest.mark.django_db
+def test_post_detail_last_modified(client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/"
+    last_modified = client.get(url)["Last-Modified"]
+    assert client.get(
+        url, HTTP_IF_MODIFIED_SINCE=last_modified
+    ).status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что страница публикации отвечает 304"
+        " на If-Modified-Since."
+    )
+    assert client.get(
+        url, HTTP_IF_MODIFIED_SINCE=http_date(0)
+    ).status_code == HTTPStatus.OK
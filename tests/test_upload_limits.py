@@ -0,0 +1,82 @@
+import os
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from blog.forms import LimitedImageField
+from blog.models import Post
+from blog.uploads import LimitedTemporaryFileUploadHandler
+
+
+@pytest.fixture(autouse=True)
+def media_root(tmp_path, settings):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def make_upload(width, height):
+    buffer = BytesIO()
+    Image.frombytes(
+        "RGB", (width, height), os.urandom(width * height * 3)
+    ).save(buffer, "PNG")
+    return SimpleUploadedFile(
+        "image.png", buffer.getvalue(), content_type="image/png"
+    )
+
+
+def post_data(category, image):
+    return {
+        "title": "С картинкой",
+        "text": "Текст",
+        "pub_date": "2020-01-01",
+        "category": category.id,
+        "is_published": True,
+        "image": image,
+    }
+
+
+@pytest.mark.django_db
+def test_oversized_upload_is_rejected_while_streaming(
+        user_client, published_category, monkeypatch
+):
+    monkeypatch.setattr(LimitedTemporaryFileUploadHandler, "max_size", 1024)
+    upload = make_upload(300, 300)
+    assert upload.size > 1024
+    response = user_client.post(
+        "/posts/create/", post_data(published_category, upload)
+    )
+    assert not Post.objects.exists(), (
+        "Убедитесь, что слишком большой файл изображения отклоняется."
+    )
+    assert "file_too_big" in {
+        error.code
+        for error in response.context["form"].errors.as_data()["image"]
+    }
+
+
+@pytest.mark.django_db
+def test_image_with_too_many_pixels_is_rejected(
+        user_client, published_category, monkeypatch
+):
+    monkeypatch.setattr(LimitedImageField, "max_pixels", 100 * 100)
+    response = user_client.post(
+        "/posts/create/", post_data(published_category, make_upload(101, 100))
+    )
+    assert not Post.objects.exists(), (
+        "Убедитесь, что изображение с слишком большим числом пикселей"
+        " отклоняется до декодирования."
+    )
+    assert "too_many_pixels" in {
+        error.code
+        for error in response.context["form"].errors.as_data()["image"]
+    }
+
+
+@pytest.mark.django_db
+def test_image_within_limits_is_accepted(user_client, published_category):
+    user_client.post(
+        "/posts/create/", post_data(published_category, make_upload(100, 100))
+    )
+    assert Post.objects.get().image